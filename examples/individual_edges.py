@@ -7,6 +7,7 @@ and work directly with the comp and sim attributes of perches.
 
 import numpy as np
 import sys
+import logging
 import os
 
 # Try different import approaches to make the script runnable from various locations
@@ -29,11 +30,16 @@ except ImportError:
         )
 
 
-def matrix_transform(matrix, vector):
-    """Transform a matrix using a vector outer product"""
-    v_column = vector.reshape(-1, 1)
-    outer_product = v_column @ v_column.T
-    return matrix + 0.1 * (matrix @ outer_product)
+def square_vector(vector):
+    """Square each element in a vector"""
+    return vector * vector
+
+
+def matrix_transform(matrix, vector, scale_factor=0.1):
+    """Transform a matrix using a vector outer product: M + s * M (v v^T)"""
+    # M (v v^T) = (M v) v^T, so the update is a matrix-vector product and an
+    # outer product, with no matrix-matrix product
+    return matrix + scale_factor * np.outer(matrix @ vector, vector)
 
 
 def main():
@@ -45,8 +51,9 @@ def main():
     #--------------------------------------------------
     print("\n1. CIRCUIT CREATION")
     
-    # Create circuit
-    circuit = CircuitBoard(name="IndividualMovers")
+    # Create circuit. Perch arrays are stored in float32, which halves the
+    # memory traffic of the matrix transform
+    circuit = CircuitBoard(name="IndividualMovers", dtype=np.float32)
     print(f"Circuit board created: {circuit.name}")
     
     # Add perches
@@ -132,34 +139,27 @@ def main():
                     # If data is directly the numpy array
                     vector = data
                     
+                # The array is returned as is: the mover stores it under its
+                # target_key ("vector"), so no result dictionary is built
                 if vector is not None:
-                    return {"vector": vector**2}
-                return {}
+                    return square_vector(vector)
+                return None
             return square_comp
             
         elif operation == "transform":
-            def transform_comp(data):
+            scale_factor = map_data.get("parameters", {}).get("scale_factor", 0.1)
+            
+            def transform_comp(matrix, vector):
                 """Transform a matrix using a vector"""
-                # Handle both dictionary inputs and direct numpy array inputs
-                if isinstance(data, dict):
-                    matrix = data.get("matrix")
-                    vector = data.get("vector")
-                else:
-                    # If we receive a tuple of (matrix, vector)
-                    if isinstance(data, tuple) and len(data) == 2:
-                        matrix, vector = data
-                    else:
-                        return {}
-                
                 if matrix is not None and vector is not None:
-                    # Create a column vector
-                    v_column = vector.reshape(-1, 1)
-                    # Create an outer product (rank-1 update)
-                    outer_product = v_column @ v_column.T
-                    # Apply transformation: scale original matrix + rank-1 update
-                    result_matrix = matrix + 0.1 * (matrix @ outer_product)
-                    return {"matrix": result_matrix}
-                return {}
+                    # Apply transformation: original matrix + scaled rank-1 update,
+                    # stored under the mover's target_key ("matrix")
+                    return matrix_transform(matrix, vector, scale_factor)
+                return None
+            
+            # Take the source values positionally, in the mover's source_keys
+            # order ("matrix", "vector"), instead of as a dictionary
+            transform_comp.positional_sources = True
             return transform_comp
             
         # Default case
@@ -175,12 +175,12 @@ def main():
     print("\n4. INITIALIZATION")
     
     # Create initial values
-    initial_vector = np.array([2.0, 3.0, 4.0])
+    initial_vector = np.array([2.0, 3.0, 4.0], dtype=np.float32)
     initial_matrix = np.array([
         [1.0, 0.1, 0.2],
         [0.1, 2.0, 0.3],
         [0.2, 0.3, 3.0]
-    ])
+    ], dtype=np.float32)
     
     # Set initial values
     circuit.set_perch_data("perch_1", {"vector": initial_vector})
@@ -282,4 +282,5 @@ def main():
     print(f"is_simulated: {circuit.is_simulated}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    main()
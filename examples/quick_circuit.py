@@ -7,6 +7,7 @@ CircuitCraft 1.2.0 terminology and features.
 
 import numpy as np
 import sys
+import logging
 import os
 
 # Try different import approaches to make the script runnable from various locations
@@ -36,7 +37,7 @@ def main():
         """Square function - used for backward solving."""
         comp = data.get("comp")
         if comp is not None:
-            return {"comp": comp**2}
+            return {"comp": comp * comp}
         return {}
     
     # Define a simple computational method for forward simulation
@@ -186,4 +187,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    main()
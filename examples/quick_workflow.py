@@ -16,6 +16,7 @@ which handles all workflow steps in one convenient call.
 
 import numpy as np
 import sys
+import logging
 import os
 
 # Try different import approaches to make the script runnable from various locations
@@ -50,7 +51,7 @@ def main():
             up_value = data
             
         if up_value is not None:
-            return {"up": up_value**2}
+            return {"up": up_value * up_value}
         return {}
     
     def add_ten(data):
@@ -139,4 +140,5 @@ def main():
     print("   - Forward: B (down=None) → C, applying add_ten (if down were not None)")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    main()
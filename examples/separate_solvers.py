@@ -12,6 +12,7 @@ It shows the current terminology in CircuitCraft 1.3.1:
 
 import numpy as np
 import sys
+import logging
 import os
 
 # Try different import approaches to make the script runnable from various locations
@@ -34,19 +35,27 @@ except ImportError:
 
 # Define computational methods
 
-def square(data):
-    """Square the up value."""
-    # Handle both dictionary inputs and direct scalar inputs
-    if isinstance(data, dict):
-        up = data.get("up")
-    else:
-        # If data is directly a scalar value
-        up = data
-        
-    if up is not None:
-        return {"up": up**2}
-    return {}
+# Numeric cores, called by the movers of both examples with the source values
+# as positional arguments and returning the target value itself, so no call
+# inspects the type of its input or builds a result dictionary
+def square_core(up):
+    """Square an up value; no result while up is unset."""
+    if up is None:
+        return None
+    return up * up
+
+
+def transition_core(up, down):
+    """Move a down value using the up value; no result while either is unset."""
+    if up is None or down is None:
+        return None
+    return down + 0.1 * up
+
 
+transition_core.positional_sources = True
+
+
+# Adapter for callers passing a dictionary or a single value
 def policy_transform(data):
     """Transform to policy function."""
     # Handle both dictionary inputs and direct scalar inputs
@@ -60,22 +69,24 @@ def policy_transform(data):
         return {"policy": 0.2 * up}
     return {}
 
-def state_transition(data):
-    """Transform the down value using the up value."""
-    # Handle both dictionary inputs and direct scalar/tuple inputs
-    if isinstance(data, dict):
-        up = data.get("up")
-        down = data.get("down")
-    else:
-        # If we receive a tuple of (up, down)
-        if isinstance(data, tuple) and len(data) >= 2:
-            up, down = data[:2]
-        else:
-            return {}
-            
-    if up is not None and down is not None:
-        return {"down": down + 0.1 * up}
-    return {}
+
+# Perches of both examples' circuits, in chain order
+PERCH_NAMES = ["perch_0", "perch_1", "perch_2"]
+
+
+def print_field(circuit, key, names):
+    """Print the value of one key for each perch, and return the values."""
+    values = circuit.get_perch_data_bulk(names, key)
+    print("\n".join(f"{name} {key}: {value}" for name, value in zip(names, values)))
+    return values
+
+
+# Comps of the manual example's movers, by the operation named in their map
+COMPS = {
+    "square": square_core,
+    "state_transition": transition_core,
+    "policy_transform": policy_transform,
+}
 
 
 def run_manual_example():
@@ -159,17 +170,8 @@ def run_manual_example():
     def comp_factory(data):
         """Create a computational method from a map."""
         map_data = data.get("map", {})
-        operation = map_data.get("operation")
-        
-        if operation == "square":
-            return square
-        elif operation == "state_transition":
-            return state_transition
-        elif operation == "policy_transform":
-            return policy_transform
-        
-        # Default fallback
-        return lambda data: {}
+        # Unknown operations fall back to a comp producing nothing
+        return COMPS.get(map_data.get("operation"), lambda *values: None)
     
     # Create computational methods for all movers
     circuit.create_comps_from_maps(comp_factory)
@@ -200,22 +202,20 @@ def run_manual_example():
     # Checking why the circuit is not solvable
     # We need to verify that terminal perches in the backward graph have up values
     # and initial perches in the forward graph have down values
-    terminal_backward = [name for name in circuit.backward_graph.nodes() 
-                         if circuit.backward_graph.out_degree(name) == 0]
-    initial_forward = [name for name in circuit.forward_graph.nodes() 
-                       if circuit.forward_graph.in_degree(name) == 0]
+    terminal_backward = circuit.get_terminal_perches("backward")
+    initial_forward = circuit.get_initial_perches("forward")
     
     print(f"\nTerminal perches in backward graph: {terminal_backward}")
     print(f"Initial perches in forward graph: {initial_forward}")
     
     # Now make sure the circuit is solvable by ensuring these perches have values
     # Get any missing terminal perches that need up values for backward solving
-    missing_up = [p for p in terminal_backward 
-                   if circuit.get_perch_data(p, "up") is None]
+    missing_up = [p for p, up in zip(terminal_backward, circuit.get_perch_data_bulk(terminal_backward, "up"))
+                  if up is None]
     
     # Get any missing initial perches that need down values for forward solving
-    missing_down = [p for p in initial_forward 
-                  if circuit.get_perch_data(p, "down") is None]
+    missing_down = [p for p, down in zip(initial_forward, circuit.get_perch_data_bulk(initial_forward, "down"))
+                    if down is None]
     
     print(f"\nPerches missing up values for backward solving: {missing_up}")
     print(f"Perches missing down values for forward solving: {missing_down}")
@@ -241,15 +241,9 @@ def run_manual_example():
     print(f"is_solved: {circuit.is_solved}")
     print(f"is_simulated: {circuit.is_simulated}")
     
-    # Print results of backward solving
-    perch0_up = circuit.get_perch_data("perch_0", "up")
-    perch1_up = circuit.get_perch_data("perch_1", "up")
-    perch2_up = circuit.get_perch_data("perch_2", "up")
-    
+    # Print results of backward solving: 5⁴ = 625, 5² = 25 and the initial 5
     print("\nBACKWARD SOLUTION RESULTS:")
-    print(f"perch_0 up: {perch0_up}")  # Should be 5⁴ = 625
-    print(f"perch_1 up: {perch1_up}")  # Should be 5² = 25
-    print(f"perch_2 up: {perch2_up}")  # Initial value: 5
+    print_field(circuit, "up", PERCH_NAMES)
     
     # 6. SOLUTION - FORWARD ONLY
     print("\n6. SOLUTION - FORWARD ONLY")
@@ -260,15 +254,10 @@ def run_manual_example():
     print(f"is_solved: {circuit.is_solved}")
     print(f"is_simulated: {circuit.is_simulated}")
     
-    # Print results of forward solving
-    perch0_down = circuit.get_perch_data("perch_0", "down")
-    perch1_down = circuit.get_perch_data("perch_1", "down")
-    perch2_down = circuit.get_perch_data("perch_2", "down")
-    
+    # Print results of forward solving: the initial 2.0, then
+    # 2.0 + 0.1 * 625 = 64.5 and 64.5 + 0.1 * 25 = 67.0
     print("\nFORWARD SOLUTION RESULTS:")
-    print(f"perch_0 down: {perch0_down}")  # Initial value: 2.0
-    print(f"perch_1 down: {perch1_down}")  # Should be 2.0 + 0.1 * 625 = 2.0 + 62.5 = 64.5
-    print(f"perch_2 down: {perch2_down}")  # Should be 64.5 + 0.1 * 25 = 64.5 + 2.5 = 67.0
+    print_field(circuit, "down", PERCH_NAMES)
     
     print("\nThis example demonstrates how to solve backward and forward operations separately.")
 
@@ -294,8 +283,8 @@ def run_automated_example():
                 {"id": "perch_2", "data_types": {"up": None}}
             ],
             edges=[
-                {"source": "perch_1", "target": "perch_0", "operation": square, "edge_type": "backward"},
-                {"source": "perch_2", "target": "perch_1", "operation": square, "edge_type": "backward"}
+                {"source": "perch_1", "target": "perch_0", "operation": square_core, "edge_type": "backward"},
+                {"source": "perch_2", "target": "perch_1", "operation": square_core, "edge_type": "backward"}
             ],
             initial_values={
                 "perch_0": {"up": None},
@@ -304,19 +293,15 @@ def run_automated_example():
             }
         )
         
-        # Print backward results
-        perch0_up = backward_circuit.get_perch_data("perch_0", "up")
-        perch1_up = backward_circuit.get_perch_data("perch_1", "up")
-        perch2_up = backward_circuit.get_perch_data("perch_2", "up")
-        
+        # Print backward results: 5⁴ = 625, 5² = 25 and the initial 5
         print("\nBACKWARD CIRCUIT RESULTS:")
-        print(f"perch_0 up: {perch0_up}")  # Should be 5⁴ = 625
-        print(f"perch_1 up: {perch1_up}")  # Should be 5² = 25
-        print(f"perch_2 up: {perch2_up}")  # Initial value: 5
+        print_field(backward_circuit, "up", PERCH_NAMES)
         
-        # Now, create and solve the forward circuit with the solved up values
-        print("\n2. CREATING FORWARD CIRCUIT")
-        forward_circuit = create_and_solve_forward_circuit(
+        # Now, add the forward movers to the backward circuit and solve them,
+        # reusing its perches and solved up values. The backward circuit is
+        # extended in place and returned, so both solves share one circuit
+        print("\n2. ADDING FORWARD MOVERS")
+        circuit = create_and_solve_forward_circuit(
             name="ForwardCircuit",
             nodes=[
                 {"id": "perch_0", "data_types": {"up": None, "down": None}},
@@ -324,41 +309,31 @@ def run_automated_example():
                 {"id": "perch_2", "data_types": {"up": None, "down": None}}
             ],
             edges=[
-                {"source": "perch_0", "target": "perch_1", "operation": state_transition, 
+                {"source": "perch_0", "target": "perch_1", "operation": transition_core, 
                  "source_keys": ["up", "down"], "target_key": "down", "edge_type": "forward"},
-                {"source": "perch_1", "target": "perch_2", "operation": state_transition,
+                {"source": "perch_1", "target": "perch_2", "operation": transition_core,
                  "source_keys": ["up", "down"], "target_key": "down", "edge_type": "forward"}
             ],
             initial_values={
-                "perch_0": {"up": perch0_up, "down": 2.0},  # Initial down and solved up from backward circuit
-                "perch_1": {"up": perch1_up, "down": None},  # Solved up from backward circuit
-                "perch_2": {"up": perch2_up, "down": None}   # Solved up from backward circuit
-            }
+                "perch_0": {"down": 2.0}  # Initial down
+            },
+            initial_circuit=backward_circuit
         )
         
-        # Print forward results
-        perch0_down = forward_circuit.get_perch_data("perch_0", "down")
-        perch1_down = forward_circuit.get_perch_data("perch_1", "down")
-        perch2_down = forward_circuit.get_perch_data("perch_2", "down")
-        
-        print("\nFORWARD CIRCUIT RESULTS:")
-        print(f"perch_0 down: {perch0_down}")  # Initial value: 2.0
-        print(f"perch_1 down: {perch1_down}")  # Should be 2.0 + 0.1 * 625 = 64.5
-        print(f"perch_2 down: {perch2_down}")  # Should be 64.5 + 0.1 * 25 = 67.0
-        
-        # Check lifecycle flags
-        print("\nBACKWARD CIRCUIT LIFECYCLE FLAGS:")
-        print(f"has_model: {backward_circuit.has_model}")
-        print(f"is_solved: {backward_circuit.is_solved}")
+        # Print forward results: the initial 2.0, then 64.5 and 67.0
+        print("\nFORWARD RESULTS:")
+        print_field(circuit, "down", PERCH_NAMES)
         
-        print("\nFORWARD CIRCUIT LIFECYCLE FLAGS:")
-        print(f"has_model: {forward_circuit.has_model}")
-        print(f"is_simulated: {forward_circuit.is_simulated}")
+        # Check lifecycle flags of the combined circuit
+        print("\nCIRCUIT LIFECYCLE FLAGS:")
+        print(f"has_model: {circuit.has_model}")
+        print(f"is_solved: {circuit.is_solved}")
+        print(f"is_simulated: {circuit.is_simulated}")
         
-        return backward_circuit, forward_circuit
+        return circuit
     
     # Run the example
-    backward_circuit, forward_circuit = create_solver_circuit()
+    circuit = create_solver_circuit()
     
     print("\nThis example demonstrates using the helper functions create_and_solve_backward_circuit")
     print("and create_and_solve_forward_circuit to solve the backward and forward components separately.")
@@ -381,4 +356,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    main()
@@ -20,6 +20,7 @@ It also demonstrates the new terminology in CircuitCraft 1.2.0:
 
 import numpy as np
 import sys
+import logging
 import os
 
 # Try different import approaches to make the script runnable from various locations
@@ -41,48 +42,36 @@ except ImportError:
 
 
 # Define computational methods
-def square(data):
+# Comps take the source values as positional arguments and return the target
+# value itself; the mover writes it to its target key, so no result dictionary
+# is built per call
+def square(comp):
     """Square the comp value."""
-    # Handle both dictionary inputs and direct scalar inputs
-    if isinstance(data, dict):
-        comp = data.get("comp")
-    else:
-        # If data is directly a scalar value
-        comp = data
-        
-    if comp is not None:
-        return {"comp": comp**2}
-    return {}
+    if comp is None:
+        return None
+    return comp * comp
 
-def add_one(data):
+def add_one(comp):
     """Add 1 to the comp value."""
-    # Handle both dictionary inputs and direct scalar inputs
-    if isinstance(data, dict):
-        comp = data.get("comp")
-    else:
-        # If data is directly a scalar value
-        comp = data
-        
-    if comp is not None:
-        return {"comp": comp + 1}
-    return {}
+    if comp is None:
+        return None
+    return comp + 1
 
-def transform_sim(data):
+def transform_sim(comp, sim):
     """Transform the sim value using the comp value."""
-    # Handle both dictionary inputs and direct scalar/tuple inputs
-    if isinstance(data, dict):
-        comp = data.get("comp")
-        sim = data.get("sim")
-    else:
-        # If we receive a tuple of (comp, sim)
-        if isinstance(data, tuple) and len(data) >= 2:
-            comp, sim = data[:2]
-        else:
-            return {}
-            
-    if comp is not None and sim is not None:
-        return {"sim": sim + 0.1 * comp}
-    return {}
+    if comp is None or sim is None:
+        return None
+    return sim + 0.1 * comp
+
+transform_sim.positional_sources = True
+
+
+# Comps by the operation named in a mover's map; register new operations here
+COMPS = {
+    "square": square,
+    "add_one": add_one,
+    "transform": transform_sim,
+}
 
 
 def main():
@@ -184,17 +173,8 @@ def main():
     def comp_factory(data):
         """Create a computational method from a map."""
         map_data = data.get("map", {})
-        operation = map_data.get("operation")
-        
-        if operation == "square":
-            return square
-        elif operation == "add_one":
-            return add_one
-        elif operation == "transform":
-            return transform_sim
-        
-        # Default fallback
-        return lambda data: {}
+        # Unknown operations fall back to a comp producing nothing
+        return COMPS.get(map_data.get("operation"), lambda *values: None)
     
     # Create computational methods for all movers
     circuit.create_comps_from_maps(comp_factory)
@@ -275,9 +255,8 @@ def main():
     print("\nOption 2: Automatic solve")
     
     # Reset perch values
+    circuit.reset(keep=["X"])
     circuit.set_perch_data("X", {"comp": 5.0, "sim": 2.0})
-    circuit.set_perch_data("Y", {"comp": None, "sim": None})
-    circuit.set_perch_data("Z", {"comp": None, "sim": None})
     
     print(f"Initial perch values: X={circuit.get_perch_data('X', 'comp')}, "
           f"Y={circuit.get_perch_data('Y', 'comp')}, Z={circuit.get_perch_data('Z', 'comp')}")
@@ -306,4 +285,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    main()
@@ -12,15 +12,12 @@ even after they have been solved.
 # Version information
 __version__ = "1.3.1"  # Updated from 1.3.0: Renamed perch.comp to perch.up and perch.sim to perch.down
 
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
-import pickle
-from pathlib import Path
-import networkx as nx
-from networkx.exception import NetworkXUnfeasible
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .circuit_board import CircuitBoard
 from .perch import Perch
 from .mover import Mover
+from .storage import PerchPopulation
 from .eulerian import add_to_circuit_board
 
 # Add Eulerian circuit functionality to CircuitBoard
@@ -30,7 +27,9 @@ __all__ = [
     'CircuitBoard',
     'Perch',
     'Mover',
+    'PerchPopulation',
     'create_and_solve_circuit',
+    'create_and_solve_circuit_batch',
     'create_and_solve_backward_circuit',
     'create_and_solve_forward_circuit',
     '__version__'
@@ -99,6 +98,77 @@ def create_and_solve_circuit(name: str,
     ...     }
     ... )
     """
+    circuit = _create_circuit(name, nodes, edges)
+    
+    # 4) Initialize the circuit
+    if initial_values:
+        for node_id, values in initial_values.items():
+            circuit.set_perch_data(node_id, values)
+    
+    # 5) Solve the circuit
+    circuit.solve()
+    
+    return circuit
+
+def create_and_solve_circuit_batch(name: str,
+                                   nodes: List[Dict[str, Any]],
+                                   edges: List[Dict[str, Any]],
+                                   initial_values_list: List[Dict[str, Dict[str, Any]]]
+                                   ) -> Tuple[CircuitBoard, PerchPopulation]:
+    """
+    Create one circuit and solve it for a batch of initial values at once.
+    
+    The initial values of all instances are stacked by (perch, key) into a
+    ``PerchPopulation`` with a leading batch axis, and the circuit is solved
+    once on the stacked arrays. Each mover runs once for the whole batch, so
+    its operation must work elementwise or over the leading axis.
+    
+    Parameters
+    ----------
+    name : str
+        Name of the circuit.
+    nodes : List[Dict[str, Any]]
+        Perch specifications, as for ``create_and_solve_circuit``.
+    edges : List[Dict[str, Any]]
+        Mover specifications, as for ``create_and_solve_circuit``.
+    initial_values_list : List[Dict[str, Dict[str, Any]]]
+        Initial values of each instance, keyed by perch id and then by data
+        key. Values that are None are not set; a floating point value
+        set for some instances only is NaN for the others.
+        
+    Returns
+    -------
+    Tuple[CircuitBoard, PerchPopulation]
+        The solved circuit board, whose perch values are the stacked arrays,
+        and the population holding the results by field.
+        
+    Raises
+    ------
+    ValueError
+        If initial_values_list is empty.
+    """
+    circuit = _create_circuit(name, nodes, edges)
+    
+    population = PerchPopulation(len(initial_values_list))
+    for instance, initial_values in enumerate(initial_values_list):
+        for node_id, values in initial_values.items():
+            for key, value in values.items():
+                if value is not None:
+                    population.set(instance, node_id, key, value)
+    population.load(circuit)
+    
+    circuit.solve()
+    population.collect(circuit)
+    
+    return circuit, population
+
+def _create_circuit(name: str,
+                    nodes: List[Dict[str, Any]],
+                    edges: List[Dict[str, Any]]) -> CircuitBoard:
+    """
+    Create, finalize and make portable the circuit described by node and edge
+    specifications (steps 1 to 3 of ``create_and_solve_circuit``).
+    """
     # 1) Create the circuit
     circuit = CircuitBoard(name=name)
     
@@ -183,14 +253,6 @@ def create_and_solve_circuit(name: str,
     
     circuit.make_portable(comp_factory)
     
-    # 4) Initialize the circuit
-    if initial_values:
-        for node_id, values in initial_values.items():
-            circuit.set_perch_data(node_id, values)
-    
-    # 5) Solve the circuit
-    circuit.solve()
-    
     return circuit
 
 def create_and_solve_backward_circuit(
@@ -319,8 +381,8 @@ def create_and_solve_backward_circuit(
         for node_id, values in initial_values.items():
             circuit.set_perch_data(node_id, values)
     
-    # 5) Solve the circuit
-    circuit.solve(backward_only=True)
+    # 5) Solve the circuit (backward only)
+    circuit.solve_backward()
     
     return circuit
 
@@ -328,7 +390,8 @@ def create_and_solve_forward_circuit(
     name: str, 
     nodes: List[Dict[str, Any]],
     edges: List[Dict[str, Any]],
-    initial_values: Optional[Dict[str, Dict[str, Any]]] = None
+    initial_values: Optional[Dict[str, Dict[str, Any]]] = None,
+    initial_circuit: Optional[CircuitBoard] = None
 ) -> CircuitBoard:
     """
     Create and solve a forward-only circuit.
@@ -337,6 +400,12 @@ def create_and_solve_forward_circuit(
     creates and solves forward edges. Useful for simulations using
     pre-computed policy functions.
     
+    With ``initial_circuit``, such as a circuit returned by
+    ``create_and_solve_backward_circuit``, no new circuit is built: the
+    forward movers are added to that circuit, which is modified in place and
+    returned, so its perches and solved values are used without copying.
+    The backward and forward results then live on one circuit.
+    
     Parameters
     ----------
     name : str
@@ -361,14 +430,19 @@ def create_and_solve_forward_circuit(
           tuning values
     initial_values : Dict[str, Dict[str, Any]], optional
         Initial values for perches, keyed by perch id and then by data key.
+    initial_circuit : CircuitBoard, optional
+        Circuit to add the forward movers to. Its name is kept. Perches in
+        ``nodes`` that it already has are given the data keys they lack, and
+        the others are added.
         
     Returns
     -------
     CircuitBoard
-        The created and solved circuit board with forward edges only.
+        The created and solved circuit board with forward edges only, or
+        ``initial_circuit`` itself (not a copy) with the forward edges added.
     """
-    # 1) Create the circuit
-    circuit = CircuitBoard(name=name)
+    # 1) Create the circuit, or reuse the one given
+    circuit = CircuitBoard(name=name) if initial_circuit is None else initial_circuit
     
     # Add perches
     for node_spec in nodes:
@@ -382,8 +456,14 @@ def create_and_solve_forward_circuit(
         # Ensure data has sim
         if 'sim' not in data_types:
             data_types['sim'] = None
-            
-        circuit.add_perch(Perch(node_id, data_types))
+        
+        perch = circuit.perches.get(node_id)
+        if perch is None:
+            circuit.add_perch(Perch(node_id, data_types))
+        else:
+            for key, value in data_types.items():
+                if key not in perch.data:
+                    perch.add_data_key(key, value)
     
     # Add forward movers
     for edge_spec in edges:
@@ -461,6 +541,6 @@ def create_and_solve_forward_circuit(
     circuit.is_solved = True
     
     # 5) Solve the circuit (forward only)
-    circuit.solve(forward_only=True)
+    circuit.solve_forward()
     
     return circuit
\ No newline at end of file
@@ -1,11 +1,17 @@
+import logging
 import pickle
-from typing import Any, Dict, List, Optional, Set, Tuple, Union, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union, Callable
 
 import networkx as nx
 import numpy as np
 
 from .perch import Perch
 from .mover import Mover
+from .storage import ABSENT, PerchStore, prepare_floating, resolve_dtype
+from .schedule import Schedule, build_schedule
+
+logger = logging.getLogger(__name__)
 
 
 class CircuitBoard:
@@ -30,7 +36,7 @@ class CircuitBoard:
     7. is_simulated: True if the forward distribution pass has been completed
     """
     
-    def __init__(self, name: str = "circuit_board"):
+    def __init__(self, name: str = "circuit_board", dtype: Any = None):
         """
         Initialize a circuit board.
         
@@ -38,10 +44,47 @@ class CircuitBoard:
         ----------
         name : str, optional
             Name of the circuit board, default is "circuit_board".
+        dtype : Any, optional
+            Floating point dtype for array data, e.g. ``np.float32`` or
+            "bfloat16" (requires ml_dtypes). Floating point arrays given to
+            ``add_perch`` and ``set_perch_data`` are cast to it; other values
+            are stored as-is. A dictionary maps data keys to dtypes instead,
+            e.g. ``{"down": np.float32}`` to store distributions in single
+            precision while keeping other keys as given. Default is None,
+            which keeps the arrays' dtypes. Either way, floating point arrays
+            that are not C-contiguous (such as slices) are stored as aligned
+            C-contiguous copies.
         """
         self.name = name
+        if isinstance(dtype, dict):
+            self.dtype = None
+            self.key_dtypes = {key: resolve_dtype(key_dtype) for key, key_dtype in dtype.items()}
+        else:
+            self.dtype = resolve_dtype(dtype)
+            self.key_dtypes: Dict[str, Any] = {}
         self.perches: Dict[str, Perch] = {}
         
+        # Perch data live in a shared column store indexed by integer perch id
+        self._store = PerchStore()
+        self._perch_index: Dict[str, int] = self._store.index
+        self._perch_list: List[Perch] = []
+        
+        # Movers by integer edge id, and packed endpoint key -> edge id
+        self._edges: List[Mover] = []
+        self._edge_by_endpoints: Dict[int, int] = {}
+        
+        # Execution schedules and edge-ordered mover lists by edge type,
+        # resolved on demand and cleared whenever the graphs change
+        self._schedules: Dict[str, Schedule] = {}
+        self._mover_lists: Dict[str, List[Mover]] = {}
+        self._end_perches: Dict[Tuple[str, str], List[str]] = {}
+        
+        # In- and out-degree of each perch id by edge type, kept up to date by
+        # add_perch and add_mover, and the cached result of the Eulerian check
+        self._in_degree: Dict[str, List[int]] = {"backward": [], "forward": []}
+        self._out_degree: Dict[str, List[int]] = {"backward": [], "forward": []}
+        self._eulerian: Optional[bool] = None
+        
         # Use two separate directed graphs for backward and forward operations
         self.backward_graph = nx.DiGraph()
         self.forward_graph = nx.DiGraph()
@@ -74,7 +117,15 @@ class CircuitBoard:
         if perch.name in self.perches:
             raise ValueError(f"Perch with name '{perch.name}' already exists")
         
+        perch._bind(self._store)
+        for key in self._store.row_keys(perch._id):
+            column = self._store.columns[key]
+            column[perch._id] = prepare_floating(column[perch._id], self.key_dtypes.get(key, self.dtype))
         self.perches[perch.name] = perch
+        self._perch_list.append(perch)
+        for degrees in (*self._in_degree.values(), *self._out_degree.values()):
+            degrees.append(0)
+        self._graph_changed()
         self.backward_graph.add_node(perch.name)
         self.forward_graph.add_node(perch.name)
         
@@ -130,8 +181,8 @@ class CircuitBoard:
         if target_name not in self.perches:
             raise ValueError(f"Target perch '{target_name}' doesn't exist")
         
-        # Get the appropriate graph
-        graph = self._get_graph(edge_type)
+        # Check the edge type before building the mover
+        self._get_graph(edge_type)
         
         # Handle deprecated source_key parameter
         if source_key is not None:
@@ -167,9 +218,7 @@ class CircuitBoard:
             source_keys=source_keys,
             target_key=target_key
         )
-        
-        # Add the edge with the mover object as an attribute
-        graph.add_edge(source_name, target_name, mover=mover)
+        self._register_mover(mover)
         
         # Set flag for backward movers
         if edge_type == "backward":
@@ -177,6 +226,33 @@ class CircuitBoard:
             
         # Reset the model flag since we've modified the graph
         self.has_model = False
+        self._graph_changed()
+    
+    def _register_mover(self, mover: Mover) -> None:
+        """
+        Give a mover its perch and edge ids and add it to its graph.
+        
+        The mover gets an integer edge id, replacing any mover already
+        connecting the same perches in the same direction.
+        """
+        edge_type = mover.edge_type
+        mover.source_id = self._perch_index[mover.source_name]
+        mover.target_id = self._perch_index[mover.target_name]
+        
+        key = self._edge_key(mover.source_id, mover.target_id, edge_type)
+        edge_id = self._edge_by_endpoints.get(key)
+        if edge_id is None:
+            edge_id = len(self._edges)
+            self._edges.append(mover)
+            self._edge_by_endpoints[key] = edge_id
+            self._out_degree[edge_type][mover.source_id] += 1
+            self._in_degree[edge_type][mover.target_id] += 1
+        else:
+            self._edges[edge_id] = mover
+        mover.edge_id = edge_id
+        
+        # Add the edge with the mover object as an attribute
+        self._get_graph(edge_type).add_edge(mover.source_name, mover.target_name, mover=mover)
     
     def set_mover_map(self, source_name: str, target_name: str, edge_type: str, map_data: Any) -> None:
         """
@@ -198,13 +274,7 @@ class CircuitBoard:
         ValueError
             If the mover doesn't exist.
         """
-        graph = self._get_graph(edge_type)
-        
-        if not graph.has_edge(source_name, target_name):
-            raise ValueError(f"{edge_type} mover from '{source_name}' to '{target_name}' doesn't exist")
-            
-        # Get the mover from edge data
-        mover = graph[source_name][target_name]["mover"]
+        mover = self._get_mover(source_name, target_name, edge_type)
         mover.set_map(map_data)
     
     def set_mover_parameters(self, source_name: str, target_name: str, edge_type: str, parameters: Dict[str, Any]) -> None:
@@ -227,13 +297,7 @@ class CircuitBoard:
         ValueError
             If the mover doesn't exist.
         """
-        graph = self._get_graph(edge_type)
-        
-        if not graph.has_edge(source_name, target_name):
-            raise ValueError(f"{edge_type} mover from '{source_name}' to '{target_name}' doesn't exist")
-            
-        # Get the mover from edge data
-        mover = graph[source_name][target_name]["mover"]
+        mover = self._get_mover(source_name, target_name, edge_type)
         mover.set_parameters(parameters)
     
     def set_mover_numerical_hyperparameters(self, source_name: str, target_name: str, edge_type: str, hyperparams: Dict[str, Any]) -> None:
@@ -256,16 +320,11 @@ class CircuitBoard:
         ValueError
             If the mover doesn't exist.
         """
-        graph = self._get_graph(edge_type)
-        
-        if not graph.has_edge(source_name, target_name):
-            raise ValueError(f"{edge_type} mover from '{source_name}' to '{target_name}' doesn't exist")
-            
-        # Get the mover from edge data
-        mover = graph[source_name][target_name]["mover"]
+        mover = self._get_mover(source_name, target_name, edge_type)
         mover.set_numerical_hyperparameters(hyperparams)
     
-    def set_mover_comp(self, source_name: str, target_name: str, edge_type: str, comp_func: Callable) -> None:
+    def set_mover_comp(self, source_name: str, target_name: str, edge_type: str, comp_func: Callable,
+                       jit: bool = False) -> None:
         """
         Set the computational method for a mover edge.
         
@@ -279,20 +338,51 @@ class CircuitBoard:
             Type of mover: "forward" or "backward".
         comp_func : Callable
             The computational function that will transform data.
+        jit : bool, optional
+            If True, compile the comp with Numba (when installed). Default is False.
             
         Raises
         ------
         ValueError
             If the mover doesn't exist.
         """
-        graph = self._get_graph(edge_type)
+        mover = self._get_mover(source_name, target_name, edge_type)
+        mover.set_comp(comp_func, jit=jit)
+    
+    @staticmethod
+    def _edge_key(source_id: int, target_id: int, edge_type: str) -> int:
+        """
+        Pack the endpoints and direction of a mover into one integer key.
+        
+        Raises
+        ------
+        ValueError
+            If the edge type is not recognized.
+        """
+        if edge_type == "forward":
+            is_forward = 1
+        elif edge_type == "backward":
+            is_forward = 0
+        else:
+            raise ValueError(f"Unrecognized edge_type: {edge_type}")
+        return (source_id << 32) | (target_id << 1) | is_forward
+    
+    def _get_mover(self, source_name: str, target_name: str, edge_type: str) -> Mover:
+        """
+        Get a mover by the names of its perches and its type.
         
-        if not graph.has_edge(source_name, target_name):
+        Raises
+        ------
+        ValueError
+            If the edge type is not recognized or the mover doesn't exist.
+        """
+        source_id = self._perch_index.get(source_name)
+        target_id = self._perch_index.get(target_name)
+        key = self._edge_key(source_id or 0, target_id or 0, edge_type)
+        edge_id = self._edge_by_endpoints.get(key)
+        if source_id is None or target_id is None or edge_id is None:
             raise ValueError(f"{edge_type} mover from '{source_name}' to '{target_name}' doesn't exist")
-            
-        # Get the mover from edge data
-        mover = graph[source_name][target_name]["mover"]
-        mover.set_comp(comp_func)
+        return self._edges[edge_id]
     
     def _get_graph(self, edge_type: str) -> nx.DiGraph:
         """Get the appropriate graph based on edge type."""
@@ -306,9 +396,16 @@ class CircuitBoard:
     def finalize_model(self) -> None:
         """
         Indicate that all perches and movers have been created.
-        Updates the has_model flag to True.
+        Updates the has_model flag to True and resolves the execution
+        schedules of both graphs.
         """
         self.has_model = True
+        for edge_type in ("backward", "forward"):
+            try:
+                self._get_schedule(edge_type)
+            except nx.NetworkXUnfeasible:
+                # Cyclic graphs are reported when solving
+                pass
         self._check_solvability()
     
     def _check_solvability(self) -> bool:
@@ -318,9 +415,14 @@ class CircuitBoard:
         
         For backward solving: At least one perch must have a comp value.
         For forward simulation: At least one perch must have a sim value.
+        
+        Once set, the flag is kept until the graph changes, so repeated
+        ``set_perch_data`` calls in a sweep do not re-scan the perches.
         """
         if not self.has_model:
             return False
+        if self.is_solvable:
+            return True
             
         # Check if we have any perches with comp for backward solve
         if self.movers_backward_exist:
@@ -339,15 +441,116 @@ class CircuitBoard:
         self.is_solvable = True
         return True
     
+    def _get_schedule(self, edge_type: str) -> Schedule:
+        """
+        Get the execution schedule of a graph, resolving it if needed.
+        
+        Backward movers are grouped by source perch and forward movers by
+        target perch, both in topological order, so every source value is
+        computed before it is read and a single pass settles an acyclic graph.
+        
+        Raises
+        ------
+        networkx.NetworkXUnfeasible
+            If the graph contains cycles.
+        """
+        schedule = self._schedules.get(edge_type)
+        if schedule is None:
+            group_by = "source" if edge_type == "backward" else "target"
+            schedule = build_schedule(self._get_graph(edge_type), group_by)
+            self._schedules[edge_type] = schedule
+        return schedule
+    
+    def _graph_changed(self) -> None:
+        """Drop everything derived from the graphs after a perch or mover is added."""
+        self._schedules.clear()
+        self._mover_lists.clear()
+        self._end_perches.clear()
+        self._eulerian = None
+        self.is_solvable = False
+    
+    def _graph_movers(self, edge_type: str) -> List[Mover]:
+        """
+        Get the movers of one graph in the graph's edge order.
+        
+        This is the order of ``graph.edges()`` (by source perch, then by the
+        order the movers were added), read from the edge list by perch id
+        without walking the graph's adjacency dictionaries, and kept until
+        the graph changes.
+        """
+        movers = self._mover_lists.get(edge_type)
+        if movers is None:
+            movers = [mover for mover in self._edges if mover.edge_type == edge_type]
+            movers.sort(key=lambda mover: mover.source_id)
+            self._mover_lists[edge_type] = movers
+        return movers
+    
+    def get_terminal_perches(self, edge_type: str) -> List[str]:
+        """
+        Get the perches with no outgoing movers of an edge type.
+        
+        Read from the perch degrees the board keeps as movers are added,
+        without walking the graph.
+        
+        Parameters
+        ----------
+        edge_type : str
+            Type of edges to consider: "forward" or "backward".
+            
+        Returns
+        -------
+        List[str]
+            Names of the terminal perches, in the order they were added.
+            
+        Raises
+        ------
+        ValueError
+            If edge_type is not "forward" or "backward".
+        """
+        return list(self._get_terminal_perches(edge_type))
+    
+    def get_initial_perches(self, edge_type: str) -> List[str]:
+        """
+        Get the perches with no incoming movers of an edge type.
+        
+        Parameters
+        ----------
+        edge_type : str
+            Type of edges to consider: "forward" or "backward".
+            
+        Returns
+        -------
+        List[str]
+            Names of the initial perches, in the order they were added.
+            
+        Raises
+        ------
+        ValueError
+            If edge_type is not "forward" or "backward".
+        """
+        return list(self._get_initial_perches(edge_type))
+    
     def _get_terminal_perches(self, edge_type: str) -> List[str]:
         """Get terminal perches (no outgoing edges) for the specified edge type."""
-        graph = self._get_graph(edge_type)
-        return [n for n in graph.nodes() if graph.out_degree(n) == 0]
+        return self._perches_without("out", edge_type)
     
     def _get_initial_perches(self, edge_type: str) -> List[str]:
         """Get initial perches (no incoming edges) for the specified edge type."""
-        graph = self._get_graph(edge_type)
-        return [n for n in graph.nodes() if graph.in_degree(n) == 0]
+        return self._perches_without("in", edge_type)
+    
+    def _perches_without(self, direction: str, edge_type: str) -> List[str]:
+        """
+        Get the perches with no "in" or "out" edges of an edge type, cached
+        until the graph changes.
+        """
+        self._get_graph(edge_type)
+        perches = self._end_perches.get((direction, edge_type))
+        if perches is None:
+            degrees = self._out_degree if direction == "out" else self._in_degree
+            names = self._store.names
+            perches = [names[i] for i, degree in enumerate(degrees[edge_type]) if degree == 0]
+            self._end_perches[(direction, edge_type)] = perches
+        return perches
     
     def create_comps_from_maps(self, comp_factory: Callable[[Dict[str, Any]], Callable]) -> None:
         """
@@ -358,17 +561,11 @@ class CircuitBoard:
         comp_factory : Callable
             Function that takes a map and returns a comp callable.
         """
-        # Process backward movers
-        for source, target, data in self.backward_graph.edges(data=True):
-            mover = data["mover"]
-            if mover.has_map and not mover.has_comp:
-                mover.create_comp_from_map(comp_factory)
-        
-        # Process forward movers
-        for source, target, data in self.forward_graph.edges(data=True):
-            mover = data["mover"]
-            if mover.has_map and not mover.has_comp:
-                mover.create_comp_from_map(comp_factory)
+        # Process backward movers, then forward movers
+        for edge_type in ("backward", "forward"):
+            for mover in self._graph_movers(edge_type):
+                if mover.has_map and not mover.has_comp:
+                    mover.create_comp_from_map(comp_factory)
         
         # Check portability status
         self._check_portability()
@@ -379,14 +576,7 @@ class CircuitBoard:
         Updates the is_portable flag if appropriate.
         """
         # For now, we'll consider it portable if all movers with maps have comps
-        for graph in [self.backward_graph, self.forward_graph]:
-            for _, _, data in graph.edges(data=True):
-                mover = data["mover"]
-                if mover.has_map and not mover.has_comp:
-                    self.is_portable = False
-                    return
-        
-        self.is_portable = True
+        self.is_portable = not any(mover.has_map and not mover.has_comp for mover in self._edges)
     
     def execute_mover(self, source_name: str, target_name: str, edge_type: str = "forward") -> Any:
         """
@@ -411,30 +601,43 @@ class CircuitBoard:
         ValueError
             If the mover doesn't exist or has no comp method.
         """
-        graph = self._get_graph(edge_type)
-        
-        if not graph.has_edge(source_name, target_name):
-            raise ValueError(f"{edge_type} mover from '{source_name}' to '{target_name}' doesn't exist")
-            
-        # Get the source perch and the mover
-        source_perch = self.perches[source_name]
-        target_perch = self.perches[target_name]
-        mover = graph[source_name][target_name]["mover"]
+        mover = self._get_mover(source_name, target_name, edge_type)
         
         if not mover.has_comp:
             raise ValueError(f"{edge_type} mover from '{source_name}' to '{target_name}' has no comp method")
         
-        # Extract data from source perch based on source_keys
-        input_data = {}
+        return self._execute(mover)
+    
+    def _execute(self, mover: Mover, reuse_out: bool = False) -> Any:
+        """
+        Execute a mover of this circuit board by perch id.
+        
+        Solvers call this directly with movers taken from a schedule, which
+        skips the lookups done by ``execute_mover``. ``reuse_out`` is passed
+        on to ``Mover.execute``.
+        """
+        target_perch = self._perch_list[mover.target_id]
+        
+        # Extract data from the source row based on source_keys
+        store = self._store
+        source_id = mover.source_id
+        values = []
         for key in mover.source_keys:
-            input_data[key] = source_perch.get_data(key)
+            if not store.has(source_id, key):
+                raise KeyError(f"Key '{key}' not found in perch '{mover.source_name}'")
+            values.append(store.columns[key][source_id])
             
-        # If there's only one source key, pass the value directly instead of a dictionary
-        if len(mover.source_keys) == 1:
-            input_data = input_data[mover.source_keys[0]]
+        # Comps with positional sources get the values as a tuple; otherwise a
+        # single source value is passed directly and several as a dictionary
+        if mover.positional_sources:
+            input_data = tuple(values)
+        elif len(values) == 1:
+            input_data = values[0]
+        else:
+            input_data = dict(zip(mover.source_keys, values))
             
         # Execute the mover's comp function
-        result = mover.execute(input_data)
+        result = mover.execute(input_data, reuse_out)
         
         # Apply the result to the target perch
         if result is None:
@@ -443,7 +646,7 @@ class CircuitBoard:
         elif isinstance(result, dict):
             # If result is a dictionary, update the target perch with the values
             for key, value in result.items():
-                if key in target_perch.get_data_keys():
+                if store.has(mover.target_id, key):
                     target_perch.set_data(key, value)
         else:
             # If result is not a dictionary, update the target_key directly
@@ -495,6 +698,92 @@ class CircuitBoard:
             
         return movers_dict
     
+    def run_schedule(self, edge_type: str, max_workers: Optional[int] = None,
+                     targets: Optional[List[str]] = None, reuse_buffers: bool = False) -> None:
+        """
+        Execute every mover of a graph once, in schedule order.
+        
+        Unlike ``solve_backward`` and ``solve_forward`` this makes a single
+        pass without change detection or progress output, which settles an
+        acyclic graph. Movers without a comp, or whose first source value is
+        None, are skipped. The pass runs as one generated function with the
+        schedule unrolled (see ``Schedule.plan``), in which runs of built-in
+        operations on float scalars are evaluated inline.
+        
+        With ``max_workers``, the schedule's levels of independent movers (see
+        ``Schedule.levels``) are run one after another, each on a thread pool.
+        This pays off when comps spend their time in code that releases the
+        GIL, such as NumPy operations on large arrays or Numba ufuncs built
+        with ``vectorizable``.
+        
+        With ``targets``, only the movers whose outputs reach the named
+        perches are run (see ``Schedule.restrict``); movers feeding perches
+        that are not read are skipped.
+        
+        With ``reuse_buffers``, comps that accept an ``out`` buffer (such as
+        the built-in operations) write their results into the arrays their
+        movers produced on the previous run with ``reuse_buffers``, which
+        saves an allocation per mover on repeated runs. Those arrays are the
+        values stored in the target perches by that run, so any reference to
+        them kept since then (e.g. from ``get_perch_data``) sees the new
+        values; copy results that must outlive the next run.
+        
+        Parameters
+        ----------
+        edge_type : str
+            Type of movers to run: "forward" or "backward".
+        max_workers : int, optional
+            Number of threads used to run independent movers concurrently.
+            Default is None, which runs the movers in the calling thread.
+        targets : List[str], optional
+            Names of the perches whose values are wanted. Default is None,
+            which runs every mover.
+        reuse_buffers : bool, optional
+            Whether to write results into the arrays of the previous run.
+            Default is False.
+            
+        Raises
+        ------
+        RuntimeError
+            If the graph contains cycles.
+        ValueError
+            If a target perch doesn't exist.
+        """
+        try:
+            schedule = self._get_schedule(edge_type)
+        except nx.NetworkXUnfeasible:
+            raise RuntimeError(f"{edge_type} graph contains cycles; cannot perform topological sort")
+        if targets is not None:
+            target_ids = []
+            for name in targets:
+                if name not in self._perch_index:
+                    raise ValueError(f"Perch '{name}' doesn't exist")
+                target_ids.append(self._perch_index[name])
+            schedule = schedule.restrict(target_ids)
+        
+        columns = self._store.columns
+        if max_workers is not None:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                # Movers of a level write to distinct perches, and only to
+                # keys those perches already have
+                for level in schedule.levels():
+                    for future in [pool.submit(self._run_scheduled, mover, columns, reuse_buffers)
+                                   for mover in level]:
+                        future.result()
+            return
+        
+        schedule.plan(reuse_buffers)(columns, self._perch_list)
+    
+    def _run_scheduled(self, mover: Mover, columns: dict, reuse_out: bool = False) -> None:
+        """Execute a mover for ``run_schedule`` unless it has no comp or input."""
+        if not mover.has_comp:
+            return
+        if mover.source_keys:
+            column = columns.get(mover.source_keys[0])
+            if column is not None and column[mover.source_id] is None:
+                return
+        self._execute(mover, reuse_out)
+    
     def solve_backward(self):
         """
         Solve all backward movers in the circuit.
@@ -511,14 +800,18 @@ class CircuitBoard:
         if not initial_perches:
             raise RuntimeError("Cannot solve backwards: No perch has a comp value")
             
-        print("Perches with initial comp values:", initial_perches)
+        # Progress is logged at DEBUG level; values are only formatted when
+        # that level is enabled
+        debug = logger.isEnabledFor(logging.DEBUG)
+        logger.debug("Perches with initial comp values: %s", initial_perches)
             
         # Create a topological sort of the backward graph
         try:
             # In backward graph: A->B means B's value depends on A's
             # So we want to solve in the order of the topological sort
-            topo_order = list(nx.topological_sort(self.backward_graph))
-            print("Topological order:", topo_order)
+            schedule = self._get_schedule("backward")
+            topo_order = schedule.order
+            logger.debug("Topological order: %s", topo_order)
             
             if not topo_order:
                 raise RuntimeError("Cannot solve backwards: Backward graph is empty")
@@ -528,70 +821,58 @@ class CircuitBoard:
             raise RuntimeError("Backward graph contains cycles; cannot perform topological sort")
             
         # Debug output of all movers
-        print("Checking all movers in backward graph:")
-        for source, target, mover_data in self.backward_graph.edges(data=True):
-            mover = mover_data.get("mover")
-            if mover:
-                print(f"Edge {source} -> {target}:")
-                print(f"  Mover type: {mover.edge_type}")
-                print(f"  Has comp: {mover.has_comp}")
-                print(f"  comp: {mover.comp}")
-                print(f"  Source perch keys: {mover.source_keys}")
-                print(f"  Target perch key: {mover.target_key}")
-                
-                # Debug perch data
-                source_perch_data = self.perches[source].get_data(mover.source_keys[0]) if mover.source_keys else None
-                target_perch_data = self.perches[target].get_data(mover.target_key) if mover.target_key else None
-                print(f"  Source perch data: {source_perch_data}")
-                print(f"  Target perch data: {target_perch_data}")
+        if debug:
+            logger.debug("Checking all movers in backward graph:")
+            for mover in self._graph_movers("backward"):
+                source_perch_data = self._perch_list[mover.source_id].get_data(mover.source_keys[0]) if mover.source_keys else None
+                target_perch_data = self._perch_list[mover.target_id].get_data(mover.target_key) if mover.target_key else None
+                logger.debug("Edge %s -> %s:\n  Mover type: %s\n  Has comp: %s\n  comp: %s\n"
+                             "  Source perch keys: %s\n  Target perch key: %s\n"
+                             "  Source perch data: %s\n  Target perch data: %s",
+                             mover.source_name, mover.target_name, mover.edge_type, mover.has_comp,
+                             mover.comp, mover.source_keys, mover.target_key,
+                             source_perch_data, target_perch_data)
             
         # Solve iteratively - repeat until no changes are made
         iteration = 0
         made_changes = True
         
-        # Keep track of previous values to detect actual changes
-        previous_values = {}
-        for perch_name, perch in self.perches.items():
-            previous_values[perch_name] = {}
-            for key in perch.get_data_keys():
-                previous_values[perch_name][key] = perch.get_data(key)
-        
         while made_changes:
             iteration += 1
-            print(f"Backward solving iteration {iteration}")
+            if debug:
+                logger.debug("Backward solving iteration %d", iteration)
             made_changes = False  # Reset flag for this iteration
             
             # Limit iterations to prevent infinite loops
             if iteration > 100:  # Set a reasonable limit
-                print("Maximum iterations reached. Stopping backward solve.")
+                logger.warning("Maximum iterations reached. Stopping backward solve.")
                 break
             
-            for source, target, mover_data in self.backward_graph.edges(data=True):
-                source_perch = self.perches[source]
-                target_perch = self.perches[target]
+            for mover in schedule.movers:
+                source, target = mover.source_name, mover.target_name
+                source_perch = self._perch_list[mover.source_id]
+                target_perch = self._perch_list[mover.target_id]
                 
                 # Check if source has the required source key values
                 source_has_data = True
                 source_comp = None
-                if mover_data.get("mover") and mover_data["mover"].source_keys:
-                    source_key = mover_data["mover"].source_keys[0] # backward movers typically only have one source key
+                if mover.source_keys:
+                    source_key = mover.source_keys[0] # backward movers typically only have one source key
                     source_comp = source_perch.get_data(source_key)
                     source_has_data = source_comp is not None
                     
-                print(f"Checking edge {source} -> {target}:")
-                print(f"  Source comp: {source_comp}")
-                print(f"  Target comp: {target_perch.comp}")
+                if debug:
+                    logger.debug("Checking edge %s -> %s:\n  Source comp: %s\n  Target comp: %s",
+                                 source, target, source_comp, target_perch.comp)
                 
                 if not source_has_data:
                     # Skip if source doesn't have the required data
                     continue
                     
-                # Get the mover for this edge
-                mover = mover_data.get("mover")
-                
-                if mover and mover.has_comp:
+                if mover.has_comp:
                     try:
-                        print(f"Executing backward mover from {source} to {target}")
+                        if debug:
+                            logger.debug("Executing backward mover from %s to %s", source, target)
                         
                         # Store previous value to detect changes
                         previous_target_value = None
@@ -599,7 +880,7 @@ class CircuitBoard:
                             previous_target_value = target_perch.get_data(mover.target_key)
                         
                         # Use our execute_mover method for consistency
-                        result = self.execute_mover(source, target, "backward")
+                        result = self._execute(mover)
                         
                         # Check if the target value has actually changed
                         current_target_value = None
@@ -623,17 +904,18 @@ class CircuitBoard:
                             value_changed = id(previous_target_value) != id(current_target_value)
                             
                         if value_changed:
-                            print(f"  Value changed: {previous_target_value} -> {current_target_value}")
+                            if debug:
+                                logger.debug("  Value changed: %s -> %s", previous_target_value, current_target_value)
                             made_changes = True
                         
                     except Exception as e:
-                        print(f"Error executing backward mover from {source} to {target}: {e}")
+                        logger.error("Error executing backward mover from %s to %s: %s", source, target, e)
         
         # Check if backward solve was successful
         if not any(perch.comp is not None for perch in self.perches.values()):
-            print("Backward solve failed: No perch has a comp value after solving")
+            logger.warning("Backward solve failed: No perch has a comp value after solving")
         else:
-            print("Backward solve completed successfully with changes made.")
+            logger.info("Backward solve completed successfully with changes made.")
             
         # Flag the circuit as solved if all perches have comp
         if all(perch.comp is not None for perch in self.perches.values()):
@@ -664,18 +946,12 @@ class CircuitBoard:
         if not initial_perches:
             raise RuntimeError("Cannot simulate forward pass: No perch has both comp and sim values.")
         
-        print(f"Initial perches for forward solving: {initial_perches}")
-        
-        # Keep track of previous values to detect actual changes
-        previous_values = {}
-        for perch_name, perch in self.perches.items():
-            previous_values[perch_name] = {}
-            for key in perch.get_data_keys():
-                previous_values[perch_name][key] = perch.get_data(key)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        logger.debug("Initial perches for forward solving: %s", initial_perches)
         
         # Get topological order for the forward graph
         try:
-            topo_order = list(nx.topological_sort(self.forward_graph))
+            schedule = self._get_schedule("forward")
             
             # Solve iteratively - repeat until no changes are made
             iteration = 0
@@ -687,70 +963,62 @@ class CircuitBoard:
                 
                 # Limit iterations to prevent infinite loops
                 if iteration > 100:  # Set a reasonable limit
-                    print("Maximum iterations reached. Stopping forward solve.")
+                    logger.warning("Maximum iterations reached. Stopping forward solve.")
                     break
                 
-                # Process perches in topological order
-                for perch_name in topo_order:
+                # Process movers grouped by target perch in topological order
+                for mover in schedule.movers:
+                    pred, perch_name = mover.source_name, mover.target_name
+                    target_perch = self._perch_list[mover.target_id]
+                    
                     # Skip perches that already have sim values from initialization
                     if perch_name in initial_perches and iteration == 1:
                         continue
                         
-                    # Find all predecessors of this perch in the forward graph
-                    predecessors = list(self.forward_graph.predecessors(perch_name))
-                    
-                    # Skip if no predecessors (and not an initial perch)
-                    if not predecessors:
+                    # Skip predecessors that don't have sim values
+                    if self._perch_list[mover.source_id].sim is None:
                         continue
                         
-                    # Try each predecessor to see if we can compute this perch's sim value
-                    for pred in predecessors:
-                        # Skip predecessors that don't have sim values
-                        if self.perches[pred].sim is None:
-                            continue
-                            
-                        # Get the mover from predecessor to this perch
-                        mover = self.forward_graph[pred][perch_name].get("mover")
-                        if not mover or not mover.has_comp:
-                            continue
-                            
-                        # Store previous value to detect changes
-                        previous_value = None
-                        if mover.target_key:
-                            previous_value = self.perches[perch_name].get_data(mover.target_key)
+                    if not mover.has_comp:
+                        continue
                         
-                        # Use our execute_mover method for consistency
-                        try:
-                            result = self.execute_mover(pred, perch_name, "forward")
+                    # Store previous value to detect changes
+                    previous_value = None
+                    if mover.target_key:
+                        previous_value = target_perch.get_data(mover.target_key)
+                    
+                    try:
+                        result = self._execute(mover)
+                        
+                        # Check if the target value has actually changed
+                        current_value = None
+                        if mover.target_key:
+                            current_value = target_perch.get_data(mover.target_key)
                             
-                            # Check if the target value has actually changed
-                            current_value = None
-                            if mover.target_key:
-                                current_value = self.perches[perch_name].get_data(mover.target_key)
-                                
-                            # Compare values properly for any data type
-                            value_changed = False
-                            if previous_value is None and current_value is not None:
-                                value_changed = True
-                            elif current_value is None and previous_value is not None:
-                                value_changed = True
-                            elif isinstance(previous_value, np.ndarray) and isinstance(current_value, np.ndarray):
-                                # Special handling for NumPy arrays
-                                value_changed = not np.array_equal(previous_value, current_value)
-                            elif hasattr(previous_value, "__eq__") and previous_value is not None:
-                                # Most objects have __eq__ defined, so use it
-                                value_changed = previous_value != current_value
-                            else:
-                                # Fallback to id comparison for objects without proper equality
-                                value_changed = id(previous_value) != id(current_value)
-                                
-                            if value_changed:
-                                print(f"  Value changed: {previous_value} -> {current_value}")
-                                made_changes = True
-                        except Exception as e:
-                            print(f"Error executing forward mover from {pred} to {perch_name}: {e}")
-            
-            print("Forward solve complete.")
+                        # Compare values properly for any data type
+                        value_changed = False
+                        if previous_value is None and current_value is not None:
+                            value_changed = True
+                        elif current_value is None and previous_value is not None:
+                            value_changed = True
+                        elif isinstance(previous_value, np.ndarray) and isinstance(current_value, np.ndarray):
+                            # Special handling for NumPy arrays
+                            value_changed = not np.array_equal(previous_value, current_value)
+                        elif hasattr(previous_value, "__eq__") and previous_value is not None:
+                            # Most objects have __eq__ defined, so use it
+                            value_changed = previous_value != current_value
+                        else:
+                            # Fallback to id comparison for objects without proper equality
+                            value_changed = id(previous_value) != id(current_value)
+                            
+                        if value_changed:
+                            if debug:
+                                logger.debug("  Value changed: %s -> %s", previous_value, current_value)
+                            made_changes = True
+                    except Exception as e:
+                        logger.error("Error executing forward mover from %s to %s: %s", pred, perch_name, e)
+            
+            logger.info("Forward solve complete.")
         except nx.NetworkXError:
             raise RuntimeError("Forward graph contains cycles; cannot perform topological sort")
             
@@ -788,14 +1056,14 @@ class CircuitBoard:
         try:
             self.solve_backward()
         except Exception as e:
-            print(f"Error during backward solving: {e}")
+            logger.error("Error during backward solving: %s", e)
             return False
             
         # Solve forward to compute sim values
         try:
             self.solve_forward()
         except Exception as e:
-            print(f"Error during forward solving: {e}")
+            logger.error("Error during forward solving: %s", e)
             return False
             
         # Update circuit status
@@ -826,10 +1094,50 @@ class CircuitBoard:
         KeyError
             If the key doesn't exist in the perch.
         """
-        if perch_name not in self.perches:
+        perch_id = self._perch_index.get(perch_name)
+        if perch_id is None:
             raise ValueError(f"Perch '{perch_name}' doesn't exist")
+        if not self._store.has(perch_id, key):
+            raise KeyError(f"Key '{key}' not found in perch '{perch_name}'")
             
-        return self.perches[perch_name].get_data(key)
+        return self._store.columns[key][perch_id]
+    
+    def get_perch_data_bulk(self, perch_names: List[str], key: str) -> List[Any]:
+        """
+        Get the data of several perches for one key.
+        
+        The key's column is looked up once and read at each perch id, instead
+        of resolving the perch and key again for every value.
+        
+        Parameters
+        ----------
+        perch_names : List[str]
+            Names of the perches.
+        key : str
+            Key of the data to retrieve.
+            
+        Returns
+        -------
+        List[Any]
+            The values, in the order of ``perch_names``.
+            
+        Raises
+        ------
+        ValueError
+            If a perch doesn't exist.
+        KeyError
+            If a perch doesn't have the key.
+        """
+        column = self._store.columns.get(key)
+        values = []
+        for perch_name in perch_names:
+            perch_id = self._perch_index.get(perch_name)
+            if perch_id is None:
+                raise ValueError(f"Perch '{perch_name}' doesn't exist")
+            if column is None or column[perch_id] is ABSENT:
+                raise KeyError(f"Key '{key}' not found in perch '{perch_name}'")
+            values.append(column[perch_id])
+        return values
     
     def set_perch_data(self, perch_name: str, data: Dict[str, Any]) -> None:
         """
@@ -854,7 +1162,7 @@ class CircuitBoard:
             
         perch = self.perches[perch_name]
         for key, value in data.items():
-            perch.set_data(key, value)
+            perch.set_data(key, prepare_floating(value, self.key_dtypes.get(key, self.dtype)))
             
         # If we're adding data to perches, they're no longer empty
         if data:
@@ -863,6 +1171,55 @@ class CircuitBoard:
         # Adding data might make the circuit solvable
         self._check_solvability()
     
+    def reset(self, keep: Iterable[str] = ()) -> None:
+        """
+        Clear the data of every perch except those in ``keep``.
+        
+        Values are set to None, as with ``Perch.clear_data``, and the perches
+        keep their keys. The circuit is no longer solved or simulated, and
+        solvability is checked again on the remaining data.
+        
+        Parameters
+        ----------
+        keep : Iterable[str], optional
+            Names of the perches whose data are kept.
+            
+        Raises
+        ------
+        ValueError
+            If a perch in keep doesn't exist.
+        """
+        keep = set(keep)
+        for perch_name in keep:
+            if perch_name not in self.perches:
+                raise ValueError(f"Perch '{perch_name}' doesn't exist")
+                
+        for perch in self._perch_list:
+            if perch.name not in keep:
+                perch.clear_data()
+                
+        self.is_solved = False
+        self.is_simulated = False
+        self.is_solvable = False
+        self._check_solvability()
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        if "_store" in state:
+            self.__dict__.update(state)
+            return
+        # Boards pickled by 1.3.1 and earlier only hold the perches, the two
+        # graphs and the lifecycle flags: rebuild the store, the edge list and
+        # the degree counters from them, keeping the pickled movers
+        self.__init__(state["name"])
+        for perch in state["perches"].values():
+            self.add_perch(perch)
+        for graph in (state["backward_graph"], state["forward_graph"]):
+            for _, _, mover in graph.edges(data="mover"):
+                self._register_mover(mover)
+        for flag in ("has_empty_perches", "has_model", "movers_backward_exist", "is_portable",
+                     "is_solvable", "is_solved", "is_simulated"):
+            setattr(self, flag, state[flag])
+    
     def save(self, filepath: str) -> None:
         """
         Save the circuit to a file.
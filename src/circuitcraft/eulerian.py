@@ -7,7 +7,10 @@ and returns to the terminal perch via forward movers.
 """
 
 import networkx as nx
+import numpy as np
+
 from .circuit_board import CircuitBoard
+from .schedule import to_csr
 
 def is_eulerian_circuit(circuit: CircuitBoard) -> bool:
     """
@@ -17,6 +20,8 @@ def is_eulerian_circuit(circuit: CircuitBoard) -> bool:
     In CircuitCraft v1.2.4+, the combined forward and backward sub-graphs must form
     an Eulerian cycle for a full back-then-forward solution to work correctly.
     
+    The result is cached on the circuit until a perch or mover is added.
+    
     Parameters
     ----------
     circuit : CircuitBoard
@@ -27,6 +32,12 @@ def is_eulerian_circuit(circuit: CircuitBoard) -> bool:
     bool
         True if the circuit forms an Eulerian cycle, False otherwise
     """
+    if circuit._eulerian is None:
+        circuit._eulerian = _check_eulerian_circuit(circuit)
+    return circuit._eulerian
+
+def _check_eulerian_circuit(circuit: CircuitBoard) -> bool:
+    """Uncached implementation of ``is_eulerian_circuit``."""
     # Check if both graphs have edges
     if not circuit.backward_graph.edges() or not circuit.forward_graph.edges():
         return False  # Need both backward and forward edges for a complete circuit
@@ -37,6 +48,17 @@ def is_eulerian_circuit(circuit: CircuitBoard) -> bool:
     if not terminal_perches:
         return False  # No terminal perches, cannot be Eulerian
     
+    # For an Eulerian circuit in a directed graph:
+    # 1. All nodes must have equal in-degree and out-degree
+    # 2. All nodes must be in a single strongly connected component
+    
+    # Check in-degree equals out-degree for all nodes, using the degree
+    # counters the circuit keeps for each mover type
+    in_degree = np.add(circuit._in_degree["backward"], circuit._in_degree["forward"])
+    out_degree = np.add(circuit._out_degree["backward"], circuit._out_degree["forward"])
+    if not np.array_equal(in_degree, out_degree):
+        return False
+    
     # Create a combined graph with both backward and forward edges
     # but with appropriate attributes to distinguish them
     combined_graph = nx.DiGraph()
@@ -51,15 +73,6 @@ def is_eulerian_circuit(circuit: CircuitBoard) -> bool:
     for u, v, data in circuit.forward_graph.edges(data=True):
         combined_graph.add_edge(u, v, edge_type="forward")
     
-    # For an Eulerian circuit in a directed graph:
-    # 1. All nodes must have equal in-degree and out-degree
-    # 2. All nodes must be in a single strongly connected component
-    
-    # Check in-degree equals out-degree for all nodes
-    for node in combined_graph.nodes():
-        if combined_graph.in_degree(node) != combined_graph.out_degree(node):
-            return False
-    
     # Check if graph is strongly connected (one SCC containing all nodes)
     if not nx.is_strongly_connected(combined_graph):
         return False
@@ -133,10 +146,62 @@ def find_backward_forward_path(graph, start_node):
     
     return None
 
+def _hierholzer(indptr, indices, start):
+    """
+    Walk an Eulerian circuit of a CSR graph with Hierholzer's algorithm.
+    
+    Each perch keeps a cursor to its next unused out-edge, so the walk is
+    O(V + E). Out-edges are taken in CSR order.
+    
+    Parameters
+    ----------
+    indptr : np.ndarray
+        CSR row pointers.
+    indices : np.ndarray
+        CSR edge targets.
+    start : int
+        Id of the perch to start from.
+        
+    Returns
+    -------
+    list
+        Perch ids in visiting order. This is an Eulerian circuit only if every
+        perch has equal in- and out-degree and all edges were reached.
+    """
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    cursor = indptr[:-1]
+    stack = [start]
+    path = []
+    while stack:
+        v = stack[-1]
+        if cursor[v] < indptr[v + 1]:
+            stack.append(indices[cursor[v]])
+            cursor[v] += 1
+        else:
+            path.append(stack.pop())
+    path.reverse()
+    return path
+
 def find_eulerian_path(circuit: CircuitBoard):
     """
-    Find an Eulerian path in the circuit, starting from a terminal perch,
-    going through all backward movers, and returning via forward movers.
+    Find an Eulerian path in the circuit: a closed walk from a terminal perch
+    of the backward graph that uses every backward and forward mover once.
+    
+    The backward and forward movers are combined into one CSR adjacency, with
+    each perch's backward movers listed before its forward movers, and walked
+    with Hierholzer's algorithm in O(V + E). A perch's unused backward movers
+    are taken before its forward movers, but the two kinds can interleave
+    along the path: it need not take every backward mover before the first
+    forward one.
+    
+    Notes
+    -----
+    Earlier versions joined a backward path from a terminal perch to an
+    initial perch with a forward path back, which did not have to use every
+    mover. The path returned now covers all movers, so it can differ from
+    the one returned before, and None is returned for circuits without such
+    a walk.
     
     Parameters
     ----------
@@ -152,27 +217,29 @@ def find_eulerian_path(circuit: CircuitBoard):
     if not circuit.backward_graph.edges() or not circuit.forward_graph.edges():
         return None  # Need both backward and forward edges for a complete path
     
-    # Create a combined graph with both backward and forward edges
-    combined_graph = nx.DiGraph()
-    combined_graph.add_nodes_from(circuit.backward_graph.nodes())
-    
-    # Add edges with attributes indicating direction
-    for u, v, data in circuit.backward_graph.edges(data=True):
-        combined_graph.add_edge(u, v, edge_type="backward")
-    
-    for u, v, data in circuit.forward_graph.edges(data=True):
-        combined_graph.add_edge(u, v, edge_type="forward")
-    
     # Get the terminal perches in the backward graph
     terminal_perches = circuit._get_terminal_perches("backward")
     if not terminal_perches:
         return None  # No terminal perches, cannot form Eulerian path
     
-    # Try to find a valid path for each terminal perch
+    # Edge endpoints as perch ids, backward movers first
+    movers = circuit._graph_movers("backward") + circuit._graph_movers("forward")
+    src_idx = np.array([mover.source_id for mover in movers], dtype=np.int32)
+    tgt_idx = np.array([mover.target_id for mover in movers], dtype=np.int32)
+    n = len(circuit._perch_list)
+    
+    # Every perch must have as many movers in as out
+    in_degree = np.add(circuit._in_degree["backward"], circuit._in_degree["forward"])
+    out_degree = np.add(circuit._out_degree["backward"], circuit._out_degree["forward"])
+    if not np.array_equal(in_degree, out_degree):
+        return None
+    
+    indptr, indices = to_csr(src_idx, tgt_idx, n)
+    names = circuit._store.names
     for terminal_perch in terminal_perches:
-        path = find_backward_forward_path(combined_graph, terminal_perch)
-        if path:
-            return path
+        path = _hierholzer(indptr, indices, circuit._perch_index[terminal_perch])
+        if len(path) == len(movers) + 1:
+            return [names[v] for v in path]
     
     return None
 
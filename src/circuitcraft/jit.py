@@ -0,0 +1,206 @@
+"""
+Optional Numba compilation of mover comps.
+
+Numba is an optional dependency. When it is not installed, ``jit_comp`` returns
+the comp unchanged and ``njit`` is a no-op decorator, so circuits behave the same
+with or without it.
+
+Compilation is attempted lazily on the first call. Comps Numba cannot type for a
+given input (for example the dictionary-unpacking comps used in the examples)
+fall back to the Python function for that input type.
+
+Scalar kernels can instead be turned into multithreaded ufuncs with
+``vectorizable``, so one operation on a large array uses every core.
+"""
+
+import functools
+import inspect
+import weakref
+from typing import Any, Callable, Optional, Sequence, Set
+
+import numpy as np
+
+
+def _numba():
+    """Return the numba module, or None if it is not installed."""
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba
+
+
+def njit(*args, **kwargs):
+    """
+    Compile a numeric kernel with ``numba.njit`` if Numba is installed.
+
+    Accepts the same arguments as ``numba.njit``, with or without parentheses.
+    Without Numba the decorated function is returned unchanged.
+    """
+    numba = _numba()
+    if numba is None:
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+    return numba.njit(*args, **kwargs)
+
+
+def _type_key(data: Any) -> Any:
+    """Cheap key identifying the Numba type class of an input."""
+    if isinstance(data, np.ndarray):
+        return (data.dtype, data.ndim, data.flags.c_contiguous)
+    return type(data)
+
+
+class JitComp:
+    """
+    Callable wrapping a comp and its Numba-compiled form.
+
+    Calls go to the compiled function when Numba can type the input, and to the
+    original Python function otherwise. Typed dictionaries returned by compiled
+    code are converted back to plain dictionaries.
+    """
+
+    supports_out = False
+
+    def __init__(self, func: Callable, **options):
+        """
+        Initialize the wrapper.
+
+        Parameters
+        ----------
+        func : Callable
+            The Python comp to compile.
+        **options
+            Options passed to ``numba.njit``. ``cache=True`` is the default,
+            and is dropped for functions whose source file Numba cannot
+            locate, e.g. ones defined with ``exec`` or in a REPL.
+        """
+        numba = _numba()
+        options.setdefault("cache", True)
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.compiled = None
+        if numba is not None:
+            try:
+                self.compiled = numba.njit(**options)(func)
+            except RuntimeError:
+                if not options["cache"]:
+                    raise
+                # No locator for the on-disk cache
+                self.compiled = numba.njit(**dict(options, cache=False))(func)
+        self._error = numba.core.errors.NumbaError if numba is not None else ()
+        self._dict_type = numba.typed.Dict if numba is not None else dict
+        self._unsupported: Set[Any] = set()
+
+    def __call__(self, *args: Any) -> Any:
+        if self.compiled is not None:
+            key = tuple(_type_key(arg) for arg in args)
+            if key not in self._unsupported:
+                try:
+                    result = self.compiled(*args)
+                except self._error:
+                    self._unsupported.add(key)
+                else:
+                    if isinstance(result, self._dict_type):
+                        result = dict(result)
+                    return result
+        return self.func(*args)
+
+    def __getstate__(self):
+        # Compiled dispatchers are rebuilt on unpickling
+        return {"func": self.func}
+
+    def __setstate__(self, state):
+        self.__init__(state["func"])
+
+
+# Wrappers in use, keyed by the ids of their function (or of its code object,
+# see ``_cache_key``) and globals, and by njit options. Each wrapper holds its
+# function, which keeps those ids valid while the entry exists. Wrappers are
+# held weakly, since they reference their key objects, so an entry goes away
+# with the last mover using it.
+_jit_comps: "weakref.WeakValueDictionary[Any, JitComp]" = weakref.WeakValueDictionary()
+
+
+def _cache_key(func: Callable) -> Any:
+    """
+    Get the object identifying a function's compiled form.
+
+    Functions without closures or defaults compile to the same code whenever
+    they share a code object and globals, e.g. a ``def`` re-executed for
+    every circuit, so they are keyed by their code object. Others are keyed
+    by the function itself. A shared wrapper holds the first copy it was
+    built for, not the later ones, so the copies are released with the
+    movers using them.
+    """
+    if func.__closure__ or func.__defaults__ or func.__kwdefaults__:
+        return func
+    return func.__code__
+
+
+def jit_comp(func: Callable, **options) -> Callable:
+    """
+    Wrap a comp for Numba compilation.
+
+    The wrapper is shared by every mover given the same function (or a copy
+    of it, see ``_cache_key``) and options while any of them holds it, so a
+    comp used on many edges or circuits is compiled once per input type.
+
+    Parameters
+    ----------
+    func : Callable
+        The comp to compile.
+    **options
+        Options passed to ``numba.njit``.
+
+    Returns
+    -------
+    Callable
+        A ``JitComp``, or ``func`` itself if Numba is not installed or ``func``
+        is not a plain Python function.
+    """
+    if _numba() is None or not inspect.isfunction(func):
+        return func
+    key = (id(_cache_key(func)), id(func.__globals__), tuple(sorted(options.items())))
+    comp = _jit_comps.get(key)
+    if comp is None:
+        comp = _jit_comps[key] = JitComp(func, **options)
+    return comp
+
+
+def vectorizable(func: Optional[Callable] = None, *, signatures: Optional[Sequence[str]] = None,
+                 target: str = "parallel") -> Callable:
+    """
+    Compile a scalar function into a ufunc with ``numba.vectorize``.
+
+    The default ``"parallel"`` target splits the elements of array inputs
+    across threads, without holding the GIL. Can be used with or without
+    arguments, e.g. ``@vectorizable`` or ``@vectorizable(target="cpu")``.
+    Without Numba the function is returned unchanged, so it should be written
+    with arithmetic that also works on arrays.
+
+    Parameters
+    ----------
+    func : Callable, optional
+        Function of scalar arguments returning a scalar.
+    signatures : Sequence[str], optional
+        Numba signatures to compile. Default is ``float64`` and ``float32``
+        for every positional parameter of ``func``.
+    target : str, optional
+        Numba vectorize target: "parallel" or "cpu". Default is "parallel".
+
+    Returns
+    -------
+    Callable
+        The ufunc, or a decorator producing it if ``func`` is not given.
+    """
+    if func is None:
+        return lambda f: vectorizable(f, signatures=signatures, target=target)
+    numba = _numba()
+    if numba is None:
+        return func
+    if signatures is None:
+        arity = len(inspect.signature(func).parameters)
+        signatures = [f"{t}({', '.join([t] * arity)})" for t in ("float64", "float32")]
+    return numba.vectorize(list(signatures), target=target)(func)
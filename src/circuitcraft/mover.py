@@ -9,8 +9,47 @@ four key attributes:
 - comp: Computational callable instantiated from the map
 """
 
+import inspect
 from typing import Any, Dict, List, Optional, Callable, Union
 
+import numpy as np
+
+from .jit import jit_comp
+
+
+def _accepts_out(comp: Optional[Callable]) -> bool:
+    """
+    Check whether a comp takes an ``out`` buffer.
+    
+    Comps can declare this with a ``supports_out`` attribute; otherwise it is
+    read from an ``out`` keyword in their signature. Ufuncs (including Numba
+    ufuncs) are excluded: they take ``out`` but do not check that it fits.
+    Such comps are only passed a buffer when execution asks for reuse (see
+    ``Mover.execute``); otherwise they are called without ``out``.
+    """
+    if comp is None:
+        return False
+    if hasattr(comp, "supports_out"):
+        return bool(comp.supports_out)
+    if isinstance(comp, np.ufunc) or isinstance(getattr(comp, "ufunc", None), np.ufunc):
+        return False
+    try:
+        parameter = inspect.signature(comp).parameters.get("out")
+    except (TypeError, ValueError):
+        return False
+    return parameter is not None and parameter.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                                                         inspect.Parameter.KEYWORD_ONLY)
+
+
+def _positional_sources(comp: Optional[Callable]) -> bool:
+    """Check whether a comp takes its source values as positional arguments."""
+    return bool(getattr(comp, "positional_sources", False))
+
+
+def _result_array(result: Any) -> Optional[np.ndarray]:
+    """Get the array a comp result can be reused as, if it is an array."""
+    return result if isinstance(result, np.ndarray) else None
+
 
 class Mover:
     """
@@ -72,6 +111,49 @@ class Mover:
         self.source_keys = source_keys or []
         self.target_key = target_key
         
+        # Integer perch and edge ids, assigned when the mover is added to a circuit board
+        self.source_id: Optional[int] = None
+        self.target_id: Optional[int] = None
+        self.edge_id: Optional[int] = None
+        
+        # Result array reused by comps that accept an ``out`` buffer
+        self._out: Optional[np.ndarray] = None
+        
+    @property
+    def comp(self) -> Optional[Callable]:
+        """The computational callable instantiated from the map."""
+        return self._comp
+    
+    @comp.setter
+    def comp(self, comp: Optional[Callable]) -> None:
+        self._comp = comp
+        self._comp_accepts_out = _accepts_out(comp)
+        self._comp_positional = _positional_sources(comp)
+        self._out = None
+    
+    @property
+    def positional_sources(self) -> bool:
+        """
+        Whether the comp takes the source values as positional arguments.
+        
+        Comps declare this with a ``positional_sources = True`` attribute.
+        They are then called as ``comp(*values)``, with one value per source
+        key in ``source_keys`` order, instead of with a dictionary keyed by
+        source key.
+        """
+        return self._comp_positional
+        
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Movers pickled before comp became a property store it as "comp",
+        # and have no out buffer or ids; the board assigns ids when it loads
+        if "comp" in state:
+            state["_comp"] = state.pop("comp")
+        for attr in ("_out", "source_id", "target_id", "edge_id"):
+            state.setdefault(attr, None)
+        self.__dict__.update(state)
+        self._comp_accepts_out = _accepts_out(self._comp)
+        self._comp_positional = _positional_sources(self._comp)
+        
     @property
     def has_map(self) -> bool:
         """Check if the mover has a map defined."""
@@ -116,7 +198,7 @@ class Mover:
         """
         self.numerical_hyperparameters = hyperparams
         
-    def set_comp(self, comp: Callable) -> None:
+    def set_comp(self, comp: Callable, jit: bool = False) -> None:
         """
         Set the computational callable (comp) for this mover.
         
@@ -124,7 +206,12 @@ class Mover:
         ----------
         comp : Callable
             The computational function that will transform data.
+        jit : bool, optional
+            If True, compile the comp with Numba (when installed) and store the
+            compiled form. Inputs Numba cannot type run the Python function.
         """
+        if jit:
+            comp = jit_comp(comp)
         self.comp = comp
         
     def create_comp_from_map(self, comp_factory: Callable[[Dict[str, Any]], Callable]) -> None:
@@ -151,14 +238,27 @@ class Mover:
             "numerical_hyperparameters": self.numerical_hyperparameters
         })
         
-    def execute(self, data: Any) -> Any:
+    def execute(self, data: Any, reuse_out: bool = False) -> Any:
         """
         Execute the mover's comp function with the provided data.
         
+        Comps that take an ``out`` keyword, or declare ``supports_out`` (such as
+        the built-in operations in ``circuitcraft.ops``), can write their result
+        in place. With ``reuse_out`` they are passed the array this mover
+        produced on its previous execution with ``reuse_out``, or None if there
+        is none, and must check that the buffer fits before writing into it.
+        That array was already stored in the target perch, so its earlier
+        value is overwritten. Without ``reuse_out`` such comps are called
+        without ``out`` and allocate a fresh result.
+        
         Parameters
         ----------
         data : Any
             Input data for the comp function. This can be a dictionary, array, or any other data type.
+            For comps with ``positional_sources``, a tuple of the source values.
+        reuse_out : bool, optional
+            Whether to pass the previous result as the ``out`` buffer.
+            Default is False.
             
         Returns
         -------
@@ -173,7 +273,16 @@ class Mover:
         if not self.has_comp:
             raise ValueError("Cannot execute: No comp function defined for this mover")
             
-        return self.comp(data)
+        args = data if self._comp_positional else (data,)
+        if self._comp_accepts_out:
+            if reuse_out:
+                result = self.comp(*args, out=self._out)
+                self._out = _result_array(result)
+                return result
+            # A result computed without reuse is never handed out as a buffer
+            self._out = None
+            
+        return self.comp(*args)
         
     def __str__(self) -> str:
         """String representation of the mover."""
@@ -0,0 +1,274 @@
+"""
+Built-in elementwise operations for CircuitCraft movers.
+
+Maps of the form ``{"operation": "scale", "parameters": {"factor": 0.5}}`` can be
+turned into comps with ``comp_factory``. The resulting comps are thin wrappers
+around NumPy ufuncs. They accept an optional ``out`` buffer, which lets a mover
+write its result into the array it produced on the previous solve instead of
+allocating a new one.
+
+Large ``float64`` arrays are evaluated with NumExpr when it is installed, which
+computes expressions such as ``x * 0.5 + 1.0`` in one cache-blocked,
+multithreaded pass instead of one NumPy pass per ufunc. Smaller contiguous
+float arrays go through Numba-compiled loops when Numba is installed, which
+cost a fraction of the ufunc dispatch for the small arrays typical of a
+circuit and do affine updates in one pass.
+"""
+
+import math
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .jit import _numba, njit
+
+# Minimum array size evaluated with NumExpr; below it NumExpr's per-call setup
+# costs more than it saves
+NUMEXPR_MIN_SIZE = 1 << 18
+
+
+def _numexpr():
+    """Return the numexpr module, or None if it is not installed."""
+    try:
+        import numexpr
+    except ImportError:
+        return None
+    return numexpr
+
+
+def _identity(x, out=None):
+    if out is None:
+        return np.copy(x)
+    np.copyto(out, x)
+    return out
+
+
+def _square(x, out=None):
+    return np.multiply(x, x, out=out)
+
+
+# Largest integer exponent computed by repeated multiplication
+_MAX_MULTIPLY_EXPONENT = 8
+
+
+def _power(x, exponent, out=None):
+    # Small integer powers are built by square-and-multiply over the bits of
+    # the exponent (x**3 = x * x * x, x**4 = (x * x)**2), each step a cheap
+    # multiply loop, instead of NumPy's generic power loop. The running
+    # result is kept in ``out``, which must then not be ``x`` itself.
+    if type(exponent) is not int or not 2 <= exponent <= _MAX_MULTIPLY_EXPONENT or out is x:
+        return np.power(x, exponent, out=out)
+    result = x
+    for bit in bin(exponent)[3:]:
+        result = np.multiply(result, result, out=out)
+        if bit == "1":
+            result = np.multiply(result, x, out=out)
+        if isinstance(result, np.ndarray):
+            out = result
+    return result
+
+
+def _affine(x, factor, offset, out=None):
+    if np.ndim(x) == 0:
+        return x * factor + offset
+    out = np.multiply(x, factor, out=out)
+    return np.add(out, offset, out=out)
+
+
+# Compiled loops over contiguous float arrays, called as kernel(x, a, b, out)
+# with the operation's parameters (if any) cast to the dtype of ``x``, so the
+# arithmetic and rounding match NumPy's for Python scalar parameters
+
+@njit(cache=True, nogil=True)
+def _scale_loop(x, a, b, out):
+    flat, result = x.reshape(x.size), out.reshape(out.size)
+    for i in range(flat.size):
+        result[i] = flat[i] * a
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _shift_loop(x, a, b, out):
+    flat, result = x.reshape(x.size), out.reshape(out.size)
+    for i in range(flat.size):
+        result[i] = flat[i] + a
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _affine_loop(x, a, b, out):
+    flat, result = x.reshape(x.size), out.reshape(out.size)
+    for i in range(flat.size):
+        result[i] = flat[i] * a + b
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _square_loop(x, a, b, out):
+    flat, result = x.reshape(x.size), out.reshape(out.size)
+    for i in range(flat.size):
+        result[i] = flat[i] * flat[i]
+    return out
+
+
+_COMPILED_LOOPS: Dict[str, Callable] = ({"scale": _scale_loop, "shift": _shift_loop,
+                                         "affine": _affine_loop, "square": _square_loop}
+                                        if _numba() is not None else {})
+
+_FLOAT_TYPES = (np.dtype(np.float32), np.dtype(np.float64))
+
+
+# Operation name -> (kernel, parameter defaults). Kernels take the input array,
+# the parameter values in declaration order, and an optional ``out`` buffer.
+OPERATIONS: Dict[str, Tuple[Callable, Dict[str, Any]]] = {
+    "identity": (_identity, {}),
+    "scale": (np.multiply, {"factor": 1.0}),
+    "shift": (np.add, {"offset": 0.0}),
+    "affine": (_affine, {"factor": 1.0, "offset": 0.0}),
+    "square": (_square, {}),
+    "power": (_power, {"exponent": 2}),
+}
+
+
+class ElementwiseOp:
+    """
+    Comp applying a built-in elementwise operation to a single source value.
+
+    Instances are callable as ``op(data, out=None)``. When ``out`` is given and
+    matches the shape and dtype of the result, the result is written into it.
+    """
+
+    supports_out = True
+
+    def __init__(self, operation: str, parameters: Optional[Dict[str, Any]] = None):
+        """
+        Initialize an elementwise operation.
+
+        Parameters
+        ----------
+        operation : str
+            Name of the operation, a key of ``OPERATIONS``.
+        parameters : Dict[str, Any], optional
+            Parameter values. Keys not used by the operation are ignored.
+
+        Raises
+        ------
+        ValueError
+            If the operation is not known.
+        """
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{operation}'")
+        kernel, defaults = OPERATIONS[operation]
+        parameters = parameters or {}
+
+        self.operation = operation
+        self.kernel = kernel
+        self.params = tuple(parameters.get(name, default) for name, default in defaults.items())
+        self.__name__ = operation
+        self._expression = self.expression
+        # The compiled loop applies when the parameters are Python scalars,
+        # which keep the dtype of a float array under NumPy's promotion rules
+        loop_name = "square" if self._expression == "x * x" else operation
+        self._loop = None
+        if all(type(p) in (int, float) for p in self.params) and loop_name in _COMPILED_LOOPS:
+            self._loop = _COMPILED_LOOPS[loop_name]
+            padded = (self.params + (0, 0))[:2]
+            self._loop_params = {dtype: tuple(dtype.type(p) for p in padded) for dtype in _FLOAT_TYPES}
+
+    @property
+    def expression(self) -> Optional[str]:
+        """
+        Python expression computing the operation on a float scalar ``x``.
+        
+        Parameters appear as literals, e.g. ``"x * 0.5"`` for scaling by 0.5.
+        None for operations without such a form (identity, powers other than
+        2) or whose parameters are not finite Python ints or floats: inf and
+        nan have no literal, and NumPy scalar parameters set the result type
+        of the operation, which a literal would lose.
+        """
+        if not all(type(p) in (int, float) and math.isfinite(p) for p in self.params):
+            return None
+        params = [repr(float(p)) for p in self.params]
+        if self.operation == "scale":
+            return f"x * {params[0]}"
+        if self.operation == "shift":
+            return f"x + {params[0]}"
+        if self.operation == "affine":
+            return f"x * {params[0]} + {params[1]}"
+        if self.operation == "square" or (self.operation == "power" and self.params[0] == 2):
+            return "x * x"
+        return None
+    
+    def _fits(self, data: Any, out: np.ndarray) -> bool:
+        """
+        Check whether ``out`` can hold the result for ``data``.
+
+        ``out`` must not overlap ``data``, since kernels such as ``_power``
+        keep intermediate results in it while still reading ``data``.
+        """
+        return (out.shape == np.shape(data) and out.dtype == np.result_type(data, *self.params)
+                and out is not data and not np.shares_memory(out, data))
+
+    def __call__(self, data: Any, out: Optional[np.ndarray] = None) -> Any:
+        """
+        Apply the operation.
+
+        Parameters
+        ----------
+        data : Any
+            Scalar or array input. ``None`` (an unset perch value) yields ``None``.
+        out : np.ndarray, optional
+            Buffer to write the result into, if compatible.
+
+        Returns
+        -------
+        Any
+            The result, which is ``out`` when the buffer was used.
+        """
+        if data is None:
+            return None
+        if self._loop is not None and type(data) is np.ndarray:
+            params = self._loop_params.get(data.dtype)
+            if (params is not None and data.ndim and data.size < NUMEXPR_MIN_SIZE
+                    and data.flags.c_contiguous):
+                if out is None or out.shape != data.shape or out.dtype != data.dtype or not (
+                        out.flags.c_contiguous and out.flags.writeable):
+                    out = np.empty_like(data)
+                return self._loop(data, params[0], params[1], out)
+        if isinstance(data, dict):
+            raise TypeError(f"Operation '{self.operation}' takes a single source value")
+        if out is not None and not self._fits(data, out):
+            out = None
+        if (self._expression is not None and isinstance(data, np.ndarray) and data.dtype == np.float64
+                and data.size >= NUMEXPR_MIN_SIZE):
+            numexpr = _numexpr()
+            if numexpr is not None:
+                return numexpr.evaluate(self._expression, local_dict={"x": data}, out=out)
+        return self.kernel(data, *self.params, out=out)
+
+    def __repr__(self) -> str:
+        return f"ElementwiseOp({self.operation!r}, params={self.params})"
+
+
+def comp_factory(data: Dict[str, Any]) -> ElementwiseOp:
+    """
+    Create a comp from a mover's map using the built-in operations.
+
+    Suitable for ``CircuitBoard.make_portable`` and
+    ``CircuitBoard.create_comps_from_maps``.
+
+    Parameters
+    ----------
+    data : Dict[str, Any]
+        Dictionary with "map", "parameters" and "numerical_hyperparameters".
+        Parameters may be given in the map under "parameters" or on the mover;
+        mover parameters take precedence.
+
+    Returns
+    -------
+    ElementwiseOp
+        The comp for the mover.
+    """
+    map_data = data.get("map", {})
+    parameters = {**map_data.get("parameters", {}), **data.get("parameters", {})}
+    return ElementwiseOp(map_data.get("operation"), parameters)
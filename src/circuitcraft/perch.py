@@ -1,5 +1,7 @@
 from typing import Any, Dict, List, Optional, Set, Union
 
+from .storage import PerchRow, PerchStore
+
 
 class Perch:
     """
@@ -10,8 +12,21 @@ class Perch:
     - down: A callable object (formerly 'distribution', like a probability distribution)
     
     Each perch can also store additional data items as needed.
+    
+    A perch is a view onto one row of a ``PerchStore``. A standalone perch owns
+    a private single-row store; once added to a circuit board, its row is moved
+    into the board's shared store and the perch only keeps its integer id.
+    
+    Arrays passed at construction are not copied: the perch stores the
+    caller's arrays themselves, so in-place changes made through either are
+    seen by both.
+    
+    Perches hold no per-instance ``__dict__``; their data lives in the store,
+    and circuits with many perches only pay for the four slots below.
     """
     
+    __slots__ = ("name", "_store", "_id", "_initialized_keys")
+    
     def __init__(self, name: str, data_types: Optional[Dict[str, Any]] = None):
         """
         Initialize a Perch in the circuit.
@@ -30,36 +45,74 @@ class Perch:
         >>> perch = Perch("initial_perch", {"up": initial_policy, "down": initial_distribution})
         """
         self.name = name
-        self.data = data_types or {"up": None, "down": None}
+        data = dict(data_types or {"up": None, "down": None})
         
         # Ensure the perch has up and down keys
-        if "up" not in self.data:
-            self.data["up"] = None
-        if "down" not in self.data:
-            self.data["down"] = None
-            
-        self._initialized_keys = {k for k, v in self.data.items() if v is not None}
+        if "up" not in data:
+            data["up"] = None
+        if "down" not in data:
+            data["down"] = None
+        
+        self._store = PerchStore()
+        self._id = self._store.add_row(name, data)
+        self._initialized_keys = {k for k, v in data.items() if v is not None}
+    
+    def __setstate__(self, state: Any) -> None:
+        # Slotted perches pickle as (None, slots); perches pickled by 1.3.1
+        # and earlier keep their values in a "data" dictionary instead
+        if isinstance(state, tuple):
+            state = state[1]
+        if "data" in state:
+            state = dict(state)
+            data = state.pop("data")
+            state["_store"] = PerchStore()
+            state["_id"] = state["_store"].add_row(state["name"], data)
+        for key, value in state.items():
+            setattr(self, key, value)
+    
+    @property
+    def data(self) -> PerchRow:
+        """Mapping view of the perch's data slots."""
+        return self._store.row(self._id)
+    
+    def _bind(self, store: PerchStore) -> int:
+        """
+        Move this perch's row into a shared store and return its new id.
+        
+        Parameters
+        ----------
+        store : PerchStore
+            The store owned by the circuit board the perch is added to.
+        """
+        data = {key: self._store.get(self._id, key) for key in self._store.row_keys(self._id)}
+        self._store = store
+        self._id = store.add_row(self.name, data)
+        return self._id
     
     @property
     def up(self) -> Any:
-        """Get the up attribute of the perch (formerly 'comp')."""
-        return self.data.get("up")
+        """Get the up attribute of the perch (formerly 'comp'), or None if the perch has no such key."""
+        if not self._store.has(self._id, "up"):
+            return None
+        return self._store.columns["up"][self._id]
     
     @up.setter
     def up(self, value: Any) -> None:
         """Set the up attribute of the perch."""
-        self.data["up"] = value
+        self._store.set(self._id, "up", value)
         self._initialized_keys.add("up")
     
     @property
     def down(self) -> Any:
-        """Get the down attribute of the perch (formerly 'sim')."""
-        return self.data.get("down")
+        """Get the down attribute of the perch (formerly 'sim'), or None if the perch has no such key."""
+        if not self._store.has(self._id, "down"):
+            return None
+        return self._store.columns["down"][self._id]
     
     @down.setter
     def down(self, value: Any) -> None:
         """Set the down attribute of the perch."""
-        self.data["down"] = value
+        self._store.set(self._id, "down", value)
         self._initialized_keys.add("down")
     
     # For backward compatibility
@@ -102,9 +155,9 @@ class Perch:
         KeyError
             If the key doesn't exist in this perch.
         """
-        if key not in self.data:
+        if not self._store.has(self._id, key):
             raise KeyError(f"Key '{key}' not found in perch '{self.name}'")
-        return self.data[key]
+        return self._store.columns[key][self._id]
     
     def set_data(self, key: str, value: Any) -> None:
         """
@@ -122,9 +175,9 @@ class Perch:
         KeyError
             If the key doesn't exist in this perch.
         """
-        if key not in self.data:
+        if not self._store.has(self._id, key):
             raise KeyError(f"Key '{key}' not found in perch '{self.name}'")
-        self.data[key] = value
+        self._store.columns[key][self._id] = value
         self._initialized_keys.add(key)
     
     def add_data_key(self, key: str, initial_value: Any = None) -> None:
@@ -138,9 +191,9 @@ class Perch:
         initial_value : Any, optional
             Initial value for the data slot, defaults to None.
         """
-        if key in self.data:
+        if self._store.has(self._id, key):
             raise ValueError(f"Key '{key}' already exists in perch '{self.name}'")
-        self.data[key] = initial_value
+        self._store.set(self._id, key, initial_value)
         if initial_value is not None:
             self._initialized_keys.add(key)
     
@@ -159,7 +212,7 @@ class Perch:
             True if all specified keys are initialized (have non-None values).
         """
         if keys is None:
-            keys = list(self.data.keys())
+            keys = self._store.row_keys(self._id)
         elif isinstance(keys, str):
             keys = [keys]
             
@@ -174,7 +227,7 @@ class Perch:
         Set[str]
             Set of all data keys.
         """
-        return set(self.data.keys())
+        return set(self._store.row_keys(self._id))
     
     def get_initialized_keys(self) -> Set[str]:
         """
@@ -197,13 +250,13 @@ class Perch:
             Key or list of keys to clear. If None, clears all keys.
         """
         if keys is None:
-            keys = list(self.data.keys())
+            keys = self._store.row_keys(self._id)
         elif isinstance(keys, str):
             keys = [keys]
             
         for key in keys:
-            if key in self.data:
-                self.data[key] = None
+            if self._store.has(self._id, key):
+                self._store.set(self._id, key, None)
                 self._initialized_keys.discard(key)
                 
     def __str__(self) -> str:
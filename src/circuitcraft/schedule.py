@@ -0,0 +1,612 @@
+"""
+Pre-resolved execution schedules for CircuitCraft solvers.
+
+A schedule fixes the order in which the movers of one graph are executed. It
+is resolved once from the graph (a topological sort) and kept as flat arrays
+of integer perch ids, so solvers iterate over it without re-querying the
+graph's adjacency by perch name.
+
+Runs of consecutive movers whose comps are built-in operations with a scalar
+expression form (see ``ElementwiseOp.expression``) are executed by generated
+straight-line Python code (see ``ScalarSegment``). ``Schedule.plan`` goes one
+step further and generates a single function running the whole schedule,
+with every perch id, key and calling convention inlined.
+"""
+
+import ast
+import builtins
+import copy
+import functools
+import hashlib
+import inspect
+import textwrap
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+import networkx as nx
+import numpy as np
+
+from .mover import Mover, _result_array
+from .storage import ABSENT
+
+
+# Compiled segment functions are shared by all schedules in the process, up
+# to this many distinct sources
+_SEGMENT_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=_SEGMENT_CACHE_SIZE)
+def _compile_segment(source: str) -> Callable:
+    """Compile generated segment source, reusing recent compilations."""
+    digest = hashlib.sha1(source.encode()).hexdigest()
+    namespace: Dict[str, object] = {}
+    exec(compile(source, f"<circuitcraft segment {digest[:12]}>", "exec"), namespace)
+    return namespace["segment"]
+
+
+def _scalar_expression(mover: Mover) -> Optional[str]:
+    """Get the scalar expression in ``x`` of a single-key mover's comp."""
+    if len(mover.source_keys) != 1 or not mover.target_key:
+        return None
+    return getattr(mover.comp, "expression", None)
+
+
+# Constructs that open a new scope or suspend, which cannot be spliced into
+# the plan's body
+_SCOPED_NODES = (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp,
+                 ast.NamedExpr, ast.Yield, ast.YieldFrom, ast.Await)
+
+
+def _comp_expression(comp: Callable) -> Optional[Tuple[List[str], ast.expr]]:
+    """
+    Get the parameters and returned expression of a single-expression comp.
+
+    Only plain functions (or lambdas alone on their source lines) without
+    closures, defaults or variadic parameters whose body is one ``return``
+    qualify; None is returned for anything else.
+    """
+    if (not inspect.isfunction(comp) or comp.__closure__ or comp.__defaults__
+            or comp.__kwdefaults__):
+        return None
+    code = comp.__code__
+    if code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS) or code.co_kwonlyargcount:
+        return None
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(comp)))
+    except (OSError, TypeError, SyntaxError):
+        return None
+    if comp.__name__ == "<lambda>":
+        lambdas = [node for node in ast.walk(tree) if isinstance(node, ast.Lambda)]
+        if len(lambdas) != 1:
+            return None
+        node, expr = lambdas[0], lambdas[0].body
+    else:
+        node = tree.body[0] if len(tree.body) == 1 else None
+        if (not isinstance(node, ast.FunctionDef) or node.name != comp.__name__
+                or node.decorator_list):
+            return None
+        body = node.body
+        if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant):
+            body = body[1:]
+        if len(body) != 1 or not isinstance(body[0], ast.Return) or body[0].value is None:
+            return None
+        expr = body[0].value
+    params = [arg.arg for arg in node.args.posonlyargs + node.args.args]
+    if len(params) != code.co_argcount or any(isinstance(n, _SCOPED_NODES) for n in ast.walk(expr)):
+        return None
+    return params, expr
+
+
+def _inline_call(comp: Callable, args: List[str], namespace: Dict[str, object]) -> Optional[str]:
+    """
+    Get the source of a comp's returned expression applied to ``args``.
+
+    Parameters are replaced by the argument names. Names defined in the
+    comp's globals are looked up there each time the expression runs, so
+    rebinding a global after the plan is generated behaves as it does for a
+    call; the globals dictionary is bound in ``namespace``. Names found only
+    in builtins are bound now. Returns None if the comp cannot be inlined.
+    """
+    found = _comp_expression(comp)
+    if found is None or len(found[0]) != len(args):
+        return None
+    params, expr = found
+    globals_name = f"g{len(namespace)}"
+    bindings: Dict[str, object] = {globals_name: comp.__globals__}
+    replacements: Dict[str, ast.expr] = {name: ast.Name(id=arg, ctx=ast.Load())
+                                         for name, arg in zip(params, args)}
+    for node in ast.walk(expr):
+        if isinstance(node, ast.Name) and node.id not in replacements:
+            if node.id in comp.__globals__:
+                replacements[node.id] = ast.Subscript(value=ast.Name(id=globals_name, ctx=ast.Load()),
+                                                      slice=ast.Constant(node.id), ctx=ast.Load())
+            elif hasattr(builtins, node.id):
+                name = f"g{len(namespace) + len(bindings)}"
+                bindings[name] = getattr(builtins, node.id)
+                replacements[node.id] = ast.Name(id=name, ctx=ast.Load())
+            else:
+                return None
+
+    class Rename(ast.NodeTransformer):
+        def visit_Name(self, node):
+            return ast.copy_location(copy.deepcopy(replacements[node.id]), node)
+
+    namespace.update(bindings)
+    return ast.unparse(Rename().visit(copy.deepcopy(expr)))
+
+
+class ScalarSegment:
+    """
+    Run of consecutive scalar movers executed by one generated function.
+
+    The perch values the run reads and writes are gathered into a local list
+    of floats or None; each (key, perch id) pair gets one slot. The movers
+    are unrolled into straight-line code with their parameters as literals,
+    e.g. ``x = buf[0]; buf[1] = x * 0.5 if x is not None else buf[1]``,
+    which avoids the per-mover dispatch and ``ElementwiseOp`` call overhead.
+    The code is kept as plain Python: compiling it with Numba costs seconds
+    for long runs and gains little over the interpreter on a few float
+    operations per mover.
+
+    A mover whose source is unset (None) leaves its target unchanged, as the
+    per-mover path skips such movers, and output slots that are still unset
+    are not written back. NaN is an ordinary value and propagates as it does
+    on the per-mover path.
+
+    Attributes
+    ----------
+    movers : List[Mover]
+        The movers of the run, in execution order.
+    slots : List[Tuple[str, int]]
+        The (key, perch id) pair held by each slot.
+    inputs : List[int]
+        Slots read before they are written.
+    outputs : List[int]
+        Slots written by the run, written back after the loop.
+    source : str
+        The generated Python source of the segment function.
+    """
+
+    def __init__(self, movers: List[Mover]):
+        """
+        Initialize a segment.
+
+        Parameters
+        ----------
+        movers : List[Mover]
+            Movers whose comps have a scalar expression, in execution order.
+        """
+        self.movers = movers
+        self.comps = [mover.comp for mover in movers]
+        self.slots: List[Tuple[str, int]] = []
+        slot_index = {}
+        self.inputs: List[int] = []
+        self.outputs: List[int] = []
+        lines = ["def segment(buf):"]
+
+        def slot(key, perch_id):
+            if (key, perch_id) not in slot_index:
+                slot_index[(key, perch_id)] = len(self.slots)
+                self.slots.append((key, perch_id))
+            return slot_index[(key, perch_id)]
+
+        for mover in movers:
+            s = slot(mover.source_keys[0], mover.source_id)
+            if s not in self.outputs and s not in self.inputs:
+                self.inputs.append(s)
+            t = slot(mover.target_key, mover.target_id)
+            if t not in self.outputs:
+                self.outputs.append(t)
+            lines.append(f"    x = buf[{s}]")
+            lines.append(f"    buf[{t}] = {_scalar_expression(mover)} if x is not None else buf[{t}]")
+
+        self.source = "\n".join(lines) + "\n"
+        self._func = _compile_segment(self.source)
+
+    def is_current(self) -> bool:
+        """Check that the movers still hold the comps the segment was built from."""
+        return all(mover.comp is comp for mover, comp in zip(self.movers, self.comps))
+
+    def run(self, columns: dict) -> Optional[List[Optional[float]]]:
+        """
+        Execute the segment on the given store columns.
+
+        Parameters
+        ----------
+        columns : dict
+            The ``columns`` of the ``PerchStore`` holding the perch data.
+
+        Returns
+        -------
+        List[Optional[float]] or None
+            The slot buffer after the run, or None if a slot holds anything
+            other than a ``float`` scalar or None, in which case nothing was
+            executed.
+        """
+        buf = []
+        for key, perch_id in self.slots:
+            column = columns.get(key)
+            if column is None:
+                return None
+            value = column[perch_id]
+            if value is None:
+                buf.append(None)
+            elif type(value) is float or type(value) is np.float64:
+                buf.append(float(value))
+            else:
+                return None
+        self._func(buf)
+        return buf
+
+    def write_back(self, buf: List[Optional[float]], perches: list) -> None:
+        """Store the set (not None) output slots of ``buf`` in their perches."""
+        for slot in self.outputs:
+            if buf[slot] is not None:
+                key, perch_id = self.slots[slot]
+                perches[perch_id].set_data(key, buf[slot])
+
+    def __getstate__(self) -> dict:
+        # The generated function cannot be pickled; it is rebuilt from the source
+        state = self.__dict__.copy()
+        del state["_func"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._func = _compile_segment(self.source)
+
+    def __len__(self) -> int:
+        return len(self.movers)
+
+
+class Schedule:
+    """
+    Ordered movers of one graph, with their source and target perch ids.
+
+    Attributes
+    ----------
+    order : List[str]
+        Perch names in topological order.
+    movers : List[Mover]
+        Movers in execution order.
+    src_idx : np.ndarray
+        ``int32`` source perch id of each mover.
+    tgt_idx : np.ndarray
+        ``int32`` target perch id of each mover.
+    edge_idx : np.ndarray
+        ``int32`` edge id of each mover.
+    """
+
+    def __init__(self, order: List[str], movers: List[Mover]):
+        """
+        Initialize a schedule.
+
+        Parameters
+        ----------
+        order : List[str]
+            Perch names in topological order.
+        movers : List[Mover]
+            Movers in execution order. Their ``source_id``, ``target_id`` and
+            ``edge_id`` must be set.
+        """
+        self.order = order
+        self.movers = movers
+        self.src_idx = np.array([mover.source_id for mover in movers], dtype=np.int32)
+        self.tgt_idx = np.array([mover.target_id for mover in movers], dtype=np.int32)
+        self.edge_idx = np.array([mover.edge_id for mover in movers], dtype=np.int32)
+        self._steps: Optional[List[Union[Mover, ScalarSegment]]] = None
+        self._levels: Optional[List[List[Mover]]] = None
+        self._plans: Dict[bool, Callable[[dict, list], None]] = {}
+        self._plan_comps: List[Optional[Callable]] = []
+        self._restricted: Dict[FrozenSet[int], "Schedule"] = {}
+
+    def steps(self) -> List[Union[Mover, ScalarSegment]]:
+        """
+        Get the movers grouped for execution.
+
+        Runs of two or more consecutive movers with scalar expressions are
+        grouped into a ``ScalarSegment``; other movers are returned as they
+        are. The grouping is redone if a grouped mover's comp changed.
+        """
+        if self._steps is None or not all(step.is_current() for step in self._steps
+                                          if isinstance(step, ScalarSegment)):
+            self._steps = self._group_steps()
+        return self._steps
+
+    def _group_steps(self) -> List[Union[Mover, ScalarSegment]]:
+        steps: List[Union[Mover, ScalarSegment]] = []
+        run: List[Mover] = []
+        for mover in self.movers + [None]:
+            if mover is not None and _scalar_expression(mover) is not None:
+                run.append(mover)
+                continue
+            if len(run) > 1:
+                steps.append(ScalarSegment(run))
+            else:
+                steps.extend(run)
+            run = []
+            if mover is not None:
+                steps.append(mover)
+        return steps
+
+    def plan(self, reuse_buffers: bool = False) -> Callable[[dict, list], None]:
+        """
+        Get a generated function running every mover of the schedule once.
+
+        The function is called as ``plan(columns, perches)`` with the
+        ``columns`` of the ``PerchStore`` and the perches by id. It unrolls
+        the steps into straight-line code: each mover reads its source values
+        by literal perch id, is skipped if it has no comp or its first source
+        value is None, and stores its result in the target perch. Scalar
+        segments fall back to their movers' code when they cannot run. The
+        function is regenerated if a mover's comp changed.
+
+        Comps that are plain functions returning a single expression are not
+        called: their expression is spliced into the plan with its parameters
+        renamed to the source values, saving a Python frame per mover. Other
+        names in the expression are looked up in the comp's globals when the
+        plan runs, as they would be by the comp. The generated code is kept
+        in the function's ``source`` attribute.
+
+        Parameters
+        ----------
+        reuse_buffers : bool, optional
+            Whether comps accepting an ``out`` buffer are passed their
+            mover's previous result, as with ``Mover.execute(reuse_out=True)``.
+            Default is False.
+
+        Raises
+        ------
+        KeyError
+            From the generated function, if a mover's source perch lacks one
+            of its source keys.
+        """
+        steps = self.steps()
+        if not all(mover.comp is comp for mover, comp in zip(self.movers, self._plan_comps)):
+            self._plans = {}
+        plan = self._plans.get(reuse_buffers)
+        if plan is None:
+            plan = self._plans[reuse_buffers] = _generate_plan(steps, reuse_buffers)
+            self._plan_comps = [mover.comp for mover in self.movers]
+        return plan
+
+    def levels(self) -> List[List[Mover]]:
+        """
+        Get the movers grouped into levels of mutually independent movers.
+
+        A mover is placed one level after the latest earlier mover it
+        conflicts with: one that writes its source or target perch, or reads
+        its target perch. The movers of a level can therefore run
+        concurrently, and running the levels in order gives the same result
+        as running the schedule in order.
+        """
+        if self._levels is None:
+            last_write: Dict[int, int] = {}
+            last_read: Dict[int, int] = {}
+            levels: List[List[Mover]] = []
+            for mover, source, target in zip(self.movers, self.src_idx.tolist(), self.tgt_idx.tolist()):
+                level = 1 + max(last_write.get(source, -1), last_write.get(target, -1),
+                                last_read.get(target, -1))
+                if level == len(levels):
+                    levels.append([])
+                levels[level].append(mover)
+                last_write[target] = level
+                last_read[source] = max(last_read.get(source, -1), level)
+            self._levels = levels
+        return self._levels
+
+    def restrict(self, target_ids: Iterable[int]) -> "Schedule":
+        """
+        Get the schedule of the movers needed to compute some perches.
+
+        A mover is kept if its target is one of ``target_ids`` or the source
+        of a kept mover, so the result runs the movers whose outputs reach
+        those perches, in the same order, and skips the rest. Restricted
+        schedules are cached by their set of target ids.
+
+        Parameters
+        ----------
+        target_ids : Iterable[int]
+            Ids of the perches whose values are wanted.
+
+        Returns
+        -------
+        Schedule
+            The restricted schedule.
+        """
+        key = frozenset(target_ids)
+        schedule = self._restricted.get(key)
+        if schedule is None:
+            needed = set(key)
+            kept: List[Mover] = []
+            # Movers come in topological order, so a reverse pass sees every
+            # consumer of a perch before the movers that write it
+            for mover in reversed(self.movers):
+                if mover.target_id in needed:
+                    kept.append(mover)
+                    needed.add(mover.source_id)
+            kept.reverse()
+            names = {mover.source_name for mover in kept} | {mover.target_name for mover in kept}
+            schedule = Schedule([name for name in self.order if name in names], kept)
+            self._restricted[key] = schedule
+        return schedule
+
+    def __getstate__(self) -> dict:
+        # Generated plans cannot be pickled; they are regenerated on first use
+        state = self.__dict__.copy()
+        state["_plans"] = {}
+        state["_plan_comps"] = []
+        return state
+
+    def __len__(self) -> int:
+        return len(self.movers)
+
+    def __repr__(self) -> str:
+        return f"Schedule({len(self.order)} perches, {len(self.movers)} movers)"
+
+
+class _MissingColumn:
+    """Column stand-in for keys no perch defines: every row is absent."""
+
+    def __getitem__(self, row: int) -> object:
+        return ABSENT
+
+
+def _raise_missing(key: str, perch_name: str) -> None:
+    raise KeyError(f"Key '{key}' not found in perch '{perch_name}'")
+
+
+def _apply_dict(perch, result: dict) -> None:
+    # Dictionary results update the target keys the perch defines
+    data = perch.data
+    for key, value in result.items():
+        if key in data:
+            perch.set_data(key, value)
+
+
+def _generate_plan(steps: List[Union[Mover, ScalarSegment]],
+                   reuse_buffers: bool = False) -> Callable[[dict, list], None]:
+    """Generate the function behind ``Schedule.plan``."""
+    namespace: Dict[str, object] = {"ABSENT": ABSENT, "_missing": _MissingColumn(),
+                                    "_raise_missing": _raise_missing, "_apply_dict": _apply_dict,
+                                    "_result_array": _result_array}
+    column_names: Dict[str, str] = {}
+    body: List[str] = []
+
+    def column(key):
+        if key not in column_names:
+            column_names[key] = f"c{len(column_names)}"
+        return column_names[key]
+
+    def emit_mover(mover, indent):
+        # Mirrors CircuitBoard._execute, Mover.execute and Perch.set_data with
+        # the mover's ids, keys and calling convention filled in
+        if not mover.has_comp:
+            return
+        m = f"m{len(namespace)}"
+        k = f"k{len(namespace)}"
+        namespace[m] = mover
+        namespace[k] = mover.comp
+        pad = " " * indent
+        body.append(f"{pad}# {mover.source_name} -> {mover.target_name}")
+        keys = mover.source_keys
+        for j, key in enumerate(keys):
+            body.append(f"{pad}x{j} = {column(key)}[{mover.source_id}]")
+        if keys:
+            body.append(f"{pad}if x0 is not None:")
+            pad += "    "
+        for j, key in enumerate(keys):
+            body.append(f"{pad}if x{j} is ABSENT: _raise_missing({key!r}, {mover.source_name!r})")
+        if mover.positional_sources:
+            arg_names = [f"x{j}" for j in range(len(keys))]
+        elif len(keys) == 1:
+            arg_names = ["x0"]
+        else:
+            arg_names = None
+        args = ", ".join(arg_names) if arg_names is not None else (
+            "{" + ", ".join(f"{key!r}: x{j}" for j, key in enumerate(keys)) + "}")
+        inlined = None
+        if arg_names is not None and not mover._comp_accepts_out:
+            inlined = _inline_call(mover.comp, arg_names, namespace)
+        if inlined is not None:
+            body.append(f"{pad}r = {inlined}")
+        elif mover._comp_accepts_out and reuse_buffers:
+            body.append(f"{pad}r = {k}({args}{', ' if args else ''}out={m}._out)")
+            body.append(f"{pad}{m}._out = _result_array(r)")
+        else:
+            if mover._comp_accepts_out:
+                body.append(f"{pad}{m}._out = None")
+            body.append(f"{pad}r = {k}({args})")
+        body.append(f"{pad}if isinstance(r, dict): _apply_dict(perches[{mover.target_id}], r)")
+        if mover.target_key:
+            target = f"{column(mover.target_key)}[{mover.target_id}]"
+            body.append(f"{pad}elif r is not None:")
+            body.append(f"{pad}    if {target} is ABSENT: _raise_missing({mover.target_key!r}, {mover.target_name!r})")
+            body.append(f"{pad}    {target} = r")
+            body.append(f"{pad}    perches[{mover.target_id}]._initialized_keys.add({mover.target_key!r})")
+
+    for step in steps:
+        if isinstance(step, ScalarSegment):
+            name = f"s{len(namespace)}"
+            namespace[name] = step
+            body.append(f"    buf = {name}.run(columns)")
+            body.append(f"    if buf is not None: {name}.write_back(buf, perches)")
+            body.append("    else:")
+            for mover in step.movers:
+                emit_mover(mover, 8)
+        else:
+            emit_mover(step, 4)
+
+    lines = ["def plan(columns, perches):"]
+    lines += [f"    {name} = columns.get({key!r}, _missing)" for key, name in column_names.items()]
+    lines += body or ["    pass"]
+    source = "\n".join(lines) + "\n"
+    exec(compile(source, "<circuitcraft plan>", "exec"), namespace)
+    plan = namespace["plan"]
+    plan.source = source
+    return plan
+
+
+def build_schedule(graph: nx.DiGraph, group_by: str = "source") -> Schedule:
+    """
+    Resolve the execution order of the movers in a graph.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph
+        Graph whose edges carry a "mover" attribute.
+    group_by : str, optional
+        "source" walks perches in topological order and runs each perch's
+        outgoing movers; "target" runs each perch's incoming movers instead.
+        Either way every mover runs after the movers feeding its source.
+        Default is "source".
+
+    Returns
+    -------
+    Schedule
+        The resolved schedule.
+
+    Raises
+    ------
+    networkx.NetworkXUnfeasible
+        If the graph contains cycles.
+    ValueError
+        If group_by is not recognized.
+    """
+    order = list(nx.topological_sort(graph))
+    if group_by == "source":
+        edges = ((source, target) for source in order for target in graph.successors(source))
+    elif group_by == "target":
+        edges = ((source, target) for target in order for source in graph.predecessors(target))
+    else:
+        raise ValueError(f"Unrecognized group_by: {group_by}")
+
+    movers = [graph[source][target]["mover"] for source, target in edges]
+    return Schedule(order, movers)
+
+
+def to_csr(src_idx: np.ndarray, tgt_idx: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build a compressed sparse row adjacency from edge endpoint arrays.
+    
+    Parameters
+    ----------
+    src_idx : np.ndarray
+        Source perch id of each edge.
+    tgt_idx : np.ndarray
+        Target perch id of each edge.
+    n : int
+        Number of perches.
+        
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        ``indptr`` of length ``n + 1`` and ``indices`` of length ``len(src_idx)``,
+        both ``int32``. The targets of perch ``v`` are
+        ``indices[indptr[v]:indptr[v + 1]]``, in the order the edges were given.
+    """
+    src_idx = np.asarray(src_idx, dtype=np.int32)
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(src_idx, minlength=n), out=indptr[1:])
+    order = np.argsort(src_idx, kind="stable")
+    indices = np.asarray(tgt_idx, dtype=np.int32)[order]
+    return indptr, indices
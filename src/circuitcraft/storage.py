@@ -0,0 +1,362 @@
+"""
+Columnar perch storage for CircuitCraft.
+
+Perch data are kept structure-of-arrays style: one column per data key, with
+one row per perch. A perch is identified by an integer id (its row), so reading
+or writing a value is a list index rather than a per-perch dictionary lookup.
+Rows that do not define a given key hold the ``ABSENT`` sentinel.
+
+``PerchPopulation`` applies the same layout across many instances of one
+circuit: each (perch, key) field is one array with a leading instance axis.
+"""
+
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional, Tuple
+
+import numpy as np
+
+
+class _Absent:
+    """Sentinel type marking a key that is not defined for a perch."""
+
+    def __repr__(self) -> str:
+        return "ABSENT"
+
+    def __reduce__(self):
+        return (_absent, ())
+
+
+def _absent() -> "_Absent":
+    return ABSENT
+
+
+ABSENT = _Absent()
+
+
+def resolve_dtype(dtype: Any) -> Optional[np.dtype]:
+    """
+    Resolve a storage dtype specification.
+    
+    Parameters
+    ----------
+    dtype : Any
+        ``None``, anything accepted by ``np.dtype``, or "bfloat16", which
+        requires the optional ``ml_dtypes`` package.
+        
+    Returns
+    -------
+    np.dtype or None
+        The dtype, or None if no dtype was given.
+        
+    Raises
+    ------
+    ImportError
+        If "bfloat16" is requested and ml_dtypes is not installed.
+    ValueError
+        If the dtype is not a floating point type.
+    """
+    if dtype is None:
+        return None
+    if isinstance(dtype, str) and dtype == "bfloat16":
+        try:
+            import ml_dtypes
+        except ImportError:
+            raise ImportError("ml_dtypes is required for bfloat16 storage. Install with 'pip install ml_dtypes'")
+        return np.dtype(ml_dtypes.bfloat16)
+    dtype = np.dtype(dtype)
+    if dtype.kind != "f":
+        raise ValueError(f"Storage dtype must be a floating point type, got {dtype}")
+    return dtype
+
+
+# Byte alignment of arrays allocated by ``aligned_empty``: a cache line, and
+# the widest SIMD register on common CPUs
+ALIGNMENT = 64
+
+
+def aligned_empty(shape: Any, dtype: Any, alignment: int = ALIGNMENT) -> np.ndarray:
+    """
+    Allocate an uninitialized C-ordered array whose data starts on an
+    ``alignment``-byte boundary.
+    """
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    raw = np.empty(nbytes + alignment, dtype=np.uint8)
+    offset = -raw.ctypes.data % alignment
+    return raw[offset:offset + nbytes].view(dtype).reshape(shape)
+
+
+def prepare_floating(value: Any, dtype: Optional[np.dtype]) -> Any:
+    """
+    Cast a floating point array to ``dtype`` and give it a C-contiguous,
+    aligned layout.
+    
+    Non-contiguous arrays (such as slices) and misaligned arrays are copied
+    once into a cache-line aligned buffer, so kernels and BLAS calls reading
+    them later do not copy them on every call. Other values, including
+    integer arrays, are returned unchanged, as are floating point arrays
+    that already have the dtype and a suitable layout.
+    """
+    if not isinstance(value, np.ndarray) or value.dtype.kind != "f":
+        return value
+    target = value.dtype if dtype is None else dtype
+    if value.flags.c_contiguous and value.flags.aligned:
+        return value if value.dtype == target else value.astype(target)
+    copy = aligned_empty(value.shape, target)
+    np.copyto(copy, value, casting="unsafe")
+    return copy
+
+
+class PerchStore:
+    """
+    Column store holding the data of a set of perches.
+
+    Each data key owns a column (a list indexed by perch id). Perches that
+    do not define a key hold ``ABSENT`` in that column.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.columns: Dict[str, List[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add_row(self, name: str, data: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Append a row for a perch and return its id.
+
+        Parameters
+        ----------
+        name : str
+            Name of the perch owning the row.
+        data : Dict[str, Any], optional
+            Initial values keyed by data key.
+
+        Returns
+        -------
+        int
+            The id (row index) of the new perch.
+        """
+        row = len(self.names)
+        self.names.append(name)
+        self.index[name] = row
+        for column in self.columns.values():
+            column.append(ABSENT)
+        for key, value in (data or {}).items():
+            self.set(row, key, value)
+        return row
+
+    def add_column(self, key: str) -> List[Any]:
+        """Create the column for ``key`` if needed and return it."""
+        column = self.columns.get(key)
+        if column is None:
+            column = [ABSENT] * len(self.names)
+            self.columns[key] = column
+        return column
+
+    def has(self, row: int, key: str) -> bool:
+        """Check whether the perch at ``row`` defines ``key``."""
+        column = self.columns.get(key)
+        return column is not None and column[row] is not ABSENT
+
+    def get(self, row: int, key: str) -> Any:
+        """
+        Get the value of ``key`` for the perch at ``row``.
+
+        Raises
+        ------
+        KeyError
+            If the perch does not define the key.
+        """
+        column = self.columns.get(key)
+        if column is None or column[row] is ABSENT:
+            raise KeyError(key)
+        return column[row]
+
+    def set(self, row: int, key: str, value: Any) -> None:
+        """Set the value of ``key`` for the perch at ``row``."""
+        self.add_column(key)[row] = value
+
+    def discard(self, row: int, key: str) -> None:
+        """Remove ``key`` from the perch at ``row`` if it is defined."""
+        column = self.columns.get(key)
+        if column is not None:
+            column[row] = ABSENT
+
+    def row_keys(self, row: int) -> List[str]:
+        """Get the keys defined for the perch at ``row``, in column order."""
+        return [key for key, column in self.columns.items() if column[row] is not ABSENT]
+
+    def row(self, row: int) -> "PerchRow":
+        """Get a mutable mapping view of the perch at ``row``."""
+        return PerchRow(self, row)
+
+
+class PerchRow(MutableMapping):
+    """
+    Dictionary-like view of one perch row in a ``PerchStore``.
+
+    This keeps ``perch.data`` usable as a mapping while the values themselves
+    live in the store's columns.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: PerchStore, row: int):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        return self._store.get(self._row, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._store.set(self._row, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if not self._store.has(self._row, key):
+            raise KeyError(key)
+        self._store.discard(self._row, key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._store.has(self._row, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.row_keys(self._row))
+
+    def __len__(self) -> int:
+        return len(self._store.row_keys(self._row))
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class PerchPopulation:
+    """
+    Perch data of a population of instances of one circuit, stored by field.
+
+    Each (perch name, key) field is one array whose leading axis indexes the
+    instances, so a field's values across the population are contiguous.
+    ``load`` sets every perch value of a circuit board to its whole field
+    array; comps that work elementwise or over a leading batch axis (such as
+    the built-in operations) then handle all instances with one call per
+    mover, and ``collect`` reads the results back by field.
+
+    Attributes
+    ----------
+    size : int
+        Number of instances.
+    dtype : np.dtype or None
+        Dtype of floating point fields, or None to keep the dtype of the
+        first value set.
+    fields : Dict[Tuple[str, str], np.ndarray]
+        Field arrays by (perch name, key).
+    """
+
+    def __init__(self, size: int, dtype: Any = None):
+        """
+        Initialize an empty population.
+
+        Parameters
+        ----------
+        size : int
+            Number of instances.
+        dtype : optional
+            Dtype of floating point fields, as accepted by ``resolve_dtype``.
+
+        Raises
+        ------
+        ValueError
+            If size is not positive.
+        """
+        if size < 1:
+            raise ValueError(f"Population size must be positive, got {size}")
+        self.size = size
+        self.dtype = resolve_dtype(dtype)
+        self.fields: Dict[Tuple[str, str], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def set(self, instance: int, perch_name: str, key: str, value: Any) -> None:
+        """
+        Set the value of a perch key for one instance.
+
+        The field array is allocated on first use, shaped by the value.
+        Instances that were not set hold NaN in floating point fields, so
+        comps run on the whole field and unset instances stay NaN (see
+        ``unset``), and zeros in other fields.
+        """
+        field = self.fields.get((perch_name, key))
+        if field is None:
+            value = np.asarray(value)
+            if value.dtype.kind == "f":
+                dtype = self.dtype if self.dtype is not None else value.dtype
+                field = np.full((self.size,) + value.shape, np.nan, dtype=dtype)
+            else:
+                field = np.zeros((self.size,) + value.shape, dtype=value.dtype)
+            self.fields[(perch_name, key)] = field
+        field[instance] = value
+
+    def get(self, perch_name: str, key: str, instance: Optional[int] = None) -> Any:
+        """
+        Get a field array, or the value of one instance.
+
+        Raises
+        ------
+        KeyError
+            If the population has no such field.
+        """
+        field = self.fields.get((perch_name, key))
+        if field is None:
+            raise KeyError(f"No field '{key}' for perch '{perch_name}' in population")
+        return field if instance is None else field[instance]
+
+    def unset(self, perch_name: str, key: str) -> np.ndarray:
+        """
+        Get the instances whose value of a floating point field is unset.
+
+        An instance is unset when all of its values in the field are NaN.
+
+        Returns
+        -------
+        np.ndarray
+            Indices of the unset instances, in increasing order.
+
+        Raises
+        ------
+        KeyError
+            If the population has no such field.
+        """
+        field = self.get(perch_name, key)
+        if field.dtype.kind != "f":
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(np.isnan(field.reshape(self.size, -1)).all(axis=1))
+
+    def load(self, circuit: "CircuitBoard") -> None:
+        """
+        Set the perch values of a circuit board to copies of the field arrays.
+
+        Later ``set`` calls therefore do not change the board's values.
+        """
+        by_perch: Dict[str, Dict[str, np.ndarray]] = {}
+        for (perch_name, key), field in self.fields.items():
+            by_perch.setdefault(perch_name, {})[key] = field.copy()
+        for perch_name, data in by_perch.items():
+            circuit.set_perch_data(perch_name, data)
+
+    def collect(self, circuit: "CircuitBoard") -> None:
+        """
+        Read the fields back from a circuit board after solving.
+
+        Every perch value that is an array with a leading axis of length
+        ``size`` is copied into the field for its (perch name, key), so later
+        solves (e.g. ``run_schedule`` with ``reuse_buffers``) and ``set``
+        calls do not share memory with the board.
+        """
+        for perch_name, perch in circuit.perches.items():
+            for key in perch.get_data_keys():
+                value = perch.get_data(key)
+                if isinstance(value, np.ndarray) and value.shape[:1] == (self.size,):
+                    self.fields[(perch_name, key)] = value.copy()
@@ -0,0 +1,72 @@
+from circuitcraft import CircuitBoard, Perch
+from circuitcraft.eulerian import find_eulerian_path
+from circuitcraft.schedule import to_csr
+
+
+def build_chain(names):
+    circuit = CircuitBoard()
+    for name in names:
+        circuit.add_perch(Perch(name))
+    for earlier, later in zip(names, names[1:]):
+        circuit.add_mover(later, earlier, source_key="up", target_key="up", edge_type="backward")
+        circuit.add_mover(earlier, later, source_key="down", target_key="down", edge_type="forward")
+    return circuit
+
+
+class TestEulerian:
+    """
+    Test suite for the Eulerian path search.
+    """
+
+    def test_to_csr(self):
+        """
+        Test that the CSR adjacency keeps edges in the order given per perch.
+        """
+        indptr, indices = to_csr([2, 0, 2, 1], [0, 1, 1, 2], 3)
+
+        assert indptr.tolist() == [0, 1, 2, 4]
+        assert indices.tolist() == [1, 2, 0, 1]
+
+    def test_path_uses_every_mover(self):
+        """
+        Test that the path traverses each backward and forward mover once.
+        """
+        circuit = build_chain(["p0", "p1", "p2", "p3"])
+        path = find_eulerian_path(circuit)
+
+        assert path[0] == path[-1] == "p0"
+        steps = list(zip(path, path[1:]))
+        movers = list(circuit.backward_graph.edges()) + list(circuit.forward_graph.edges())
+        assert sorted(steps) == sorted(movers)
+
+    def test_unbalanced_circuit_has_no_path(self):
+        """
+        Test that a perch with more movers in than out rules out a path.
+        """
+        circuit = build_chain(["p0", "p1", "p2"])
+        circuit.add_mover("p2", "p0", source_key="down", target_key="down", edge_type="forward")
+
+        assert find_eulerian_path(circuit) is None
+
+    def test_degree_counters_and_cached_check(self):
+        """
+        Test that degree counters follow added movers and reset the cached check.
+        """
+        circuit = build_chain(["p0", "p1", "p2"])
+
+        assert circuit._out_degree["backward"] == [0, 1, 1]
+        assert circuit._in_degree["forward"] == [0, 1, 1]
+        assert circuit._get_terminal_perches("backward") == ["p0"]
+        assert circuit._get_initial_perches("forward") == ["p0"]
+
+        assert circuit.is_eulerian()
+        assert circuit._eulerian is True
+
+        # Re-adding an existing mover does not change the degrees
+        circuit.add_mover("p1", "p0", source_key="up", target_key="up", edge_type="backward")
+        assert circuit._eulerian is None
+        assert circuit._out_degree["backward"] == [0, 1, 1]
+        assert circuit.is_eulerian()
+
+        circuit.add_mover("p2", "p0", source_key="down", target_key="down", edge_type="forward")
+        assert not circuit.is_eulerian()
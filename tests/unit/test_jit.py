@@ -0,0 +1,171 @@
+import gc
+import weakref
+
+import numpy as np
+import pytest
+
+from circuitcraft import CircuitBoard, Perch
+from circuitcraft.jit import JitComp, _jit_comps, jit_comp, vectorizable
+
+numba = pytest.importorskip("numba")
+
+
+def cube(x):
+    return x * x * x
+
+
+def square_dict(data):
+    if isinstance(data, dict):
+        x = data.get("up")
+    else:
+        x = data
+    if x is not None:
+        return {"up": x * x}
+    return {}
+
+
+class TestJit:
+    """
+    Test suite for optional Numba compilation of comps.
+    """
+
+    def test_numeric_comp_is_compiled(self):
+        """
+        Test that a numeric comp runs through its compiled form.
+        """
+        comp = jit_comp(cube)
+
+        assert isinstance(comp, JitComp)
+        assert comp.__name__ == "cube"
+        assert comp(2.0) == 8.0
+        np.testing.assert_array_equal(comp(np.array([1.0, 2.0])), [1.0, 8.0])
+        assert comp.compiled.signatures
+
+    def test_compiled_comps_are_shared(self):
+        """
+        Test that wrapping the same function twice reuses one compiled comp.
+        """
+        assert jit_comp(cube) is jit_comp(cube)
+        assert jit_comp(cube, fastmath=True) is not jit_comp(cube)
+
+        def make(offset=None):
+            if offset is None:
+                def comp(x):
+                    return x + 1.0
+            else:
+                def comp(x):
+                    return x + offset
+            return comp
+
+        assert jit_comp(make()) is jit_comp(make())
+        assert jit_comp(make(1.0)) is not jit_comp(make(1.0))
+        assert jit_comp(make(2.0))(1.0) == 3.0
+
+    def test_released_comps_leave_the_cache(self):
+        """
+        Test that cached wrappers do not keep their functions alive.
+        """
+        def make(offset):
+            def comp(x):
+                return x + offset
+            return comp
+
+        size = len(_jit_comps)
+        funcs = [make(float(i)) for i in range(5)]
+        comps = [jit_comp(func) for func in funcs]
+        assert comps[3](1.0) == 4.0
+        assert len(_jit_comps) == size + 5
+
+        ref = weakref.ref(funcs[0])
+        del funcs, comps
+        gc.collect()
+        assert ref() is None
+        assert len(_jit_comps) == size
+
+        # Copies of one def share a wrapper keyed by their code object
+        def make_copy():
+            def comp(x):
+                return x + 1.0
+            return comp
+
+        first, second = make_copy(), make_copy()
+        comp = jit_comp(first)
+        assert jit_comp(second) is comp and comp.func is first
+        refs = [weakref.ref(first), weakref.ref(second), weakref.ref(comp)]
+        del second
+        gc.collect()
+        assert refs[1]() is None and refs[2]() is comp
+        del first, comp
+        gc.collect()
+        assert all(ref() is None for ref in refs)
+        assert len(_jit_comps) == size
+
+    def test_comp_without_source_file(self):
+        """
+        Test that comps defined with exec are compiled without the disk cache.
+        """
+        namespace = {}
+        exec("def double(x):\n    return x * 2.0\n", namespace)
+        comp = jit_comp(namespace["double"])
+
+        assert isinstance(comp, JitComp) and comp.compiled is not None
+        assert comp(2.0) == 4.0
+
+    def test_untypable_inputs_fall_back(self):
+        """
+        Test that inputs Numba cannot type run the Python function, and that
+        typed dictionaries come back as plain dictionaries.
+        """
+        comp = jit_comp(square_dict)
+
+        result = comp(3.0)
+        assert type(result) is dict
+        assert result == {"up": 9.0}
+        assert comp({"up": 2.0}) == {"up": 4.0}
+        assert comp(None) == {}
+
+    def test_non_functions_are_not_wrapped(self):
+        """
+        Test that callables other than plain functions are returned unchanged.
+        """
+        class Scale:
+            def __call__(self, x):
+                return 2 * x
+
+        scale = Scale()
+        assert jit_comp(scale) is scale
+
+    def test_set_mover_comp_with_jit(self):
+        """
+        Test that set_mover_comp stores the compiled comp on the mover.
+        """
+        circuit = CircuitBoard()
+        circuit.add_perch(Perch("p0"))
+        circuit.add_perch(Perch("p1", {"up": 2.0}))
+        circuit.add_mover("p1", "p0", source_key="up", target_key="up", edge_type="backward")
+        circuit.set_mover_comp("p1", "p0", "backward", cube, jit=True)
+
+        assert isinstance(circuit.backward_graph["p1"]["p0"]["mover"].comp, JitComp)
+        circuit.execute_mover("p1", "p0", "backward")
+        assert circuit.get_perch_data("p0", "up") == 8.0
+
+    def test_vectorizable(self):
+        """
+        Test that vectorizable builds a ufunc usable as a mover comp.
+        """
+        @vectorizable
+        def halve(x):
+            return 0.5 * x
+
+        assert isinstance(halve, np.ufunc)
+        np.testing.assert_array_equal(halve(np.array([2.0, 4.0])), [1.0, 2.0])
+        assert halve(np.arange(3, dtype=np.float32)).dtype == np.float32
+
+        circuit = CircuitBoard()
+        circuit.add_perch(Perch("p0"))
+        circuit.add_perch(Perch("p1", {"up": np.array([2.0, 6.0])}))
+        circuit.add_mover("p1", "p0", source_key="up", target_key="up", edge_type="backward")
+        circuit.set_mover_comp("p1", "p0", "backward", halve)
+        for _ in range(2):
+            circuit.execute_mover("p1", "p0", "backward")
+        np.testing.assert_array_equal(circuit.get_perch_data("p0", "up"), [1.0, 3.0])
@@ -0,0 +1,226 @@
+import numpy as np
+import pytest
+
+from circuitcraft import CircuitBoard, Perch
+from circuitcraft.ops import NUMEXPR_MIN_SIZE, ElementwiseOp, comp_factory
+
+
+class TestOps:
+    """
+    Test suite for the built-in elementwise operations.
+    """
+
+    def test_scalar_and_array_inputs(self):
+        """
+        Test that operations apply to scalars and arrays alike.
+        """
+        halve = ElementwiseOp("scale", {"factor": 0.5})
+        add_one = ElementwiseOp("shift", {"offset": 1.0})
+
+        assert halve(4.0) == 2.0
+        assert add_one(None) is None
+        np.testing.assert_array_equal(ElementwiseOp("square")(np.array([2.0, 3.0])), [4.0, 9.0])
+        np.testing.assert_array_equal(
+            ElementwiseOp("affine", {"factor": 2.0, "offset": 1.0})(np.array([1.0, 2.0])), [3.0, 5.0])
+
+        squared = ElementwiseOp("power")(np.array([2, 3]))
+        assert squared.dtype == np.array([2, 3]).dtype
+        np.testing.assert_array_equal(squared, [4, 9])
+        np.testing.assert_array_equal(ElementwiseOp("power", {"exponent": 2.0})(np.array([2, 3])), [4.0, 9.0])
+        for exponent in [3, 5, 8, 9]:
+            np.testing.assert_array_equal(ElementwiseOp("power", {"exponent": exponent})(np.array([2, 3])),
+                                          np.array([2, 3]) ** exponent)
+        assert ElementwiseOp("power", {"exponent": 3})(2.0) == 8.0
+
+    def test_out_buffer_reused_when_compatible(self):
+        """
+        Test that a compatible out buffer receives the result.
+        """
+        square = ElementwiseOp("square")
+        x = np.array([1.0, 2.0, 3.0])
+        out = np.empty(3)
+
+        assert square(x, out=out) is out
+        np.testing.assert_array_equal(out, [1.0, 4.0, 9.0])
+
+        # Incompatible buffers are ignored rather than broadcast into
+        assert square(np.array([1.0, 2.0]), out=out) is not out
+
+        # Buffers overlapping the input are ignored too
+        cube = ElementwiseOp("power", {"exponent": 3})
+        x = np.linspace(1.0, 2.0, NUMEXPR_MIN_SIZE)
+        expected = x * x * x
+        assert cube(x, out=x) is not x
+        np.testing.assert_array_equal(cube(x, out=x[::-1]), expected)
+
+    def test_large_arrays_use_numexpr(self):
+        """
+        Test that large float64 arrays evaluated with NumExpr match NumPy and fill out.
+        """
+        pytest.importorskip("numexpr")
+        affine = ElementwiseOp("affine", {"factor": 0.5, "offset": 1.0})
+        x = np.linspace(0.0, 1.0, NUMEXPR_MIN_SIZE)
+        out = np.empty_like(x)
+
+        assert affine(x, out=out) is out
+        np.testing.assert_allclose(out, x * 0.5 + 1.0)
+        assert affine(x.astype(np.float32)).dtype == np.float32
+
+        # Parameters without a literal form go to NumPy instead
+        scale = ElementwiseOp("scale", {"factor": float("inf")})
+        np.testing.assert_array_equal(scale(np.ones(NUMEXPR_MIN_SIZE)), np.inf)
+
+    def test_compiled_loops_match_numpy(self):
+        """
+        Test that small float arrays run through compiled loops give NumPy's
+        results and dtypes, and fill a compatible out buffer.
+        """
+        pytest.importorskip("numba")
+        x = np.linspace(-2.0, 3.0, 12).reshape(3, 4)
+        for dtype in [np.float32, np.float64]:
+            data = x.astype(dtype)
+            affine = ElementwiseOp("affine", {"factor": 0.3, "offset": 1.7})
+            result = affine(data)
+            assert result.dtype == dtype
+            np.testing.assert_array_equal(result, np.add(np.multiply(data, 0.3), 1.7))
+            assert affine(data, out=result) is result
+            np.testing.assert_array_equal(ElementwiseOp("square")(data), data * data)
+            np.testing.assert_array_equal(ElementwiseOp("shift", {"offset": 2})(data), data + 2)
+
+        # Non-contiguous inputs and NumPy scalar parameters take the NumPy path
+        np.testing.assert_array_equal(ElementwiseOp("scale", {"factor": 2.0})(x[:, ::2]), x[:, ::2] * 2.0)
+        assert ElementwiseOp("scale", {"factor": np.float64(2.0)})(x.astype(np.float32)).dtype == np.float64
+
+    def test_comp_factory(self):
+        """
+        Test that maps resolve to operations, with mover parameters taking precedence.
+        """
+        op = comp_factory({"map": {"operation": "scale", "parameters": {"factor": 3.0}},
+                           "parameters": {"factor": 0.25, "description": "ignored"}})
+        assert op(8.0) == 2.0
+
+        with pytest.raises(ValueError):
+            comp_factory({"map": {"operation": "unknown"}})
+
+    def test_mover_reuses_its_output_array(self):
+        """
+        Test that runs with reuse_buffers write a mover's result into the same array.
+        """
+        circuit = CircuitBoard()
+        circuit.add_perch(Perch("p0"))
+        circuit.add_perch(Perch("p1"))
+        circuit.add_perch(Perch("p2"))
+        circuit.add_mover("p1", "p0", map_data={"operation": "scale", "parameters": {"factor": 0.5}},
+                          source_key="up", target_key="up", edge_type="backward")
+        circuit.add_mover("p2", "p1", map_data={"operation": "shift", "parameters": {"offset": 1.0}},
+                          source_key="up", target_key="up", edge_type="backward")
+        circuit.make_portable(comp_factory)
+        circuit.finalize_model()
+
+        circuit.set_perch_data("p2", {"up": np.array([1.0, 3.0])})
+        circuit.run_schedule("backward", reuse_buffers=True)
+        first = circuit.get_perch_data("p0", "up")
+        np.testing.assert_array_equal(first, [1.0, 2.0])
+
+        circuit.set_perch_data("p2", {"up": np.array([3.0, 5.0])})
+        circuit.run_schedule("backward", reuse_buffers=True)
+        assert circuit.get_perch_data("p0", "up") is first
+        np.testing.assert_array_equal(first, [2.0, 3.0])
+
+    def test_results_survive_reruns(self):
+        """
+        Test that results held across reruns keep their values by default.
+        """
+        circuit = CircuitBoard()
+        circuit.add_perch(Perch("A", {"up": None}))
+        circuit.add_perch(Perch("B", {"up": None}))
+        circuit.add_mover("B", "A", map_data={"operation": "scale", "parameters": {"factor": 2.0}},
+                          source_key="up", target_key="up", edge_type="backward")
+        circuit.make_portable(comp_factory)
+
+        for run in (lambda: circuit.execute_mover("B", "A", "backward"),
+                    lambda: circuit.run_schedule("backward"),
+                    lambda: circuit.run_schedule("backward", max_workers=2)):
+            results = []
+            for value in (1.0, 10.0, 100.0):
+                circuit.set_perch_data("B", {"up": np.full(2, value)})
+                run()
+                results.append(circuit.get_perch_data("A", "up"))
+            np.testing.assert_array_equal(results, [[2.0, 2.0], [20.0, 20.0], [200.0, 200.0]])
+
+    def test_user_comp_with_out_keyword(self):
+        """
+        Test that user comps taking an out keyword get the mover's previous
+        result only in runs with reuse_buffers.
+        """
+        calls = []
+
+        def halve(x, out=None):
+            calls.append(out)
+            return np.multiply(x, 0.5, out=out)
+
+        circuit = CircuitBoard()
+        circuit.add_perch(Perch("p0"))
+        circuit.add_perch(Perch("p1", {"up": np.array([2.0, 4.0])}))
+        circuit.add_mover("p1", "p0", source_key="up", target_key="up", edge_type="backward")
+        circuit.set_mover_comp("p1", "p0", "backward", halve)
+
+        first = circuit.execute_mover("p1", "p0", "backward")
+        circuit.execute_mover("p1", "p0", "backward")
+        circuit.run_schedule("backward")
+        assert calls == [None, None, None]
+        assert circuit.get_perch_data("p0", "up") is not first
+
+        del calls[:]
+        circuit.run_schedule("backward", reuse_buffers=True)
+        circuit.run_schedule("backward", reuse_buffers=True)
+        second = circuit.get_perch_data("p0", "up")
+        assert calls == [None, second]
+        assert second is not first
+        np.testing.assert_array_equal(circuit.get_perch_data("p0", "up"), [1.0, 2.0])
+
+        # Arrays returned inside a result dictionary are not reused
+        def halve_dict(data, out=None):
+            calls.append(out)
+            return {"up": np.multiply(data, 0.5, out=out)}
+
+        circuit.set_mover_comp("p1", "p0", "backward", halve_dict)
+        circuit.run_schedule("backward", reuse_buffers=True)
+        third = circuit.get_perch_data("p0", "up")
+        circuit.run_schedule("backward", reuse_buffers=True)
+        assert calls[2:] == [None, None]
+        assert circuit.get_perch_data("p0", "up") is not third
+        np.testing.assert_array_equal(third, [1.0, 2.0])
+
+    def test_positional_sources(self):
+        """
+        Test that comps declaring positional_sources get the source values as arguments.
+        """
+        def combine(up, down, out=None):
+            return up - down
+
+        combine.positional_sources = True
+
+        circuit = CircuitBoard()
+        circuit.add_perch(Perch("p0", {"up": 5.0, "down": 2.0}))
+        circuit.add_perch(Perch("p1", {"down": None}))
+        circuit.add_mover("p0", "p1", source_keys=["up", "down"], target_key="down", edge_type="forward")
+        circuit.set_mover_comp("p0", "p1", "forward", combine)
+
+        assert circuit.forward_graph["p0"]["p1"]["mover"].positional_sources
+        assert circuit.execute_mover("p0", "p1", "forward") == 3.0
+        assert circuit.get_perch_data("p1", "down") == 3.0
+
+    def test_scalar_expressions(self):
+        """
+        Test that operations expose scalar expressions with literal parameters.
+        """
+        assert ElementwiseOp("scale", {"factor": 0.5}).expression == "x * 0.5"
+        assert ElementwiseOp("affine", {"factor": 2, "offset": 1.0}).expression == "x * 2.0 + 1.0"
+        assert ElementwiseOp("power", {"exponent": 2}).expression == "x * x"
+        assert ElementwiseOp("power", {"exponent": 3}).expression is None
+        assert ElementwiseOp("identity").expression is None
+        assert ElementwiseOp("scale", {"factor": np.array([1.0, 2.0])}).expression is None
+        assert ElementwiseOp("scale", {"factor": float("inf")}).expression is None
+        assert ElementwiseOp("shift", {"offset": float("nan")}).expression is None
+        assert ElementwiseOp("scale", {"factor": np.float32(0.1)}).expression is None
@@ -0,0 +1,385 @@
+import pickle
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from circuitcraft import (CircuitBoard, Mover, Perch, PerchPopulation, create_and_solve_backward_circuit,
+                          create_and_solve_circuit_batch, create_and_solve_forward_circuit)
+from circuitcraft.ops import comp_factory
+
+
+class Pickled131:
+    """
+    Stand-in that pickles as an instance of ``cls`` holding ``state`` as its
+    ``__dict__``, which is how objects from circuitcraft 1.3.1 were pickled.
+    """
+
+    def __init__(self, cls, state):
+        self.cls = cls
+        self.state = state
+
+    def __reduce__(self):
+        return object.__new__, (self.cls,), self.state
+
+
+class TestPerch:
+    """
+    Test suite for the Perch class and its column-store backing.
+    """
+
+    def test_perch_initialization(self):
+        """
+        Test that a standalone Perch gets up and down slots by default.
+        """
+        perch = Perch("p", {"vector": None})
+
+        assert perch.name == "p"
+        assert perch.get_data_keys() == {"vector", "up", "down"}
+        assert perch.up is None
+        assert perch.down is None
+        assert not perch.is_initialized()
+
+    def test_set_and_get_data(self):
+        """
+        Test that values round-trip through the perch view.
+        """
+        perch = Perch("p", {"up": 1.0, "down": None})
+        perch.set_data("down", 2.0)
+
+        assert perch.get_data("up") == 1.0
+        assert perch.down == 2.0
+        assert perch.data["down"] == 2.0
+        assert perch.is_initialized(["up", "down"])
+
+    def test_unknown_key_raises(self):
+        """
+        Test that reading or writing an undeclared key raises KeyError.
+        """
+        perch = Perch("p")
+
+        with pytest.raises(KeyError):
+            perch.get_data("missing")
+        with pytest.raises(KeyError):
+            perch.set_data("missing", 1.0)
+
+    def test_bind_moves_row_into_board_store(self):
+        """
+        Test that adding a perch to a board rebinds it to the shared store.
+        """
+        circuit = CircuitBoard()
+        a = Perch("a", {"up": 3.0})
+        b = Perch("b", {"up": None, "extra": 7})
+
+        circuit.add_perch(a)
+        circuit.add_perch(b)
+
+        assert a._store is circuit._store
+        assert b._store is circuit._store
+        assert circuit._perch_index == {"a": 0, "b": 1}
+        assert circuit.get_perch_data("a", "up") == 3.0
+        assert circuit.get_perch_data("b", "extra") == 7
+
+        # Keys are per perch even though columns are shared
+        with pytest.raises(KeyError):
+            circuit.get_perch_data("a", "extra")
+
+        circuit.set_perch_data("a", {"up": 4.0})
+        assert a.up == 4.0
+    
+    def test_arrays_are_stored_as_given(self):
+        """
+        Test that construction arrays are stored without copying and stay writable.
+        """
+        values = np.arange(3.0)
+        perch = Perch("p", {"up": values})
+        assert perch.up is values
+
+        perch.up[0] = 10.0
+        assert values[0] == 10.0
+
+        circuit = CircuitBoard()
+        circuit.add_perch(perch)
+        circuit.get_perch_data("p", "up")[1] = 20.0
+        np.testing.assert_array_equal(values, [10.0, 20.0, 2.0])
+    
+    def test_removed_up_and_down_read_as_none(self):
+        """
+        Test that up and down read as None once their keys are removed.
+        """
+        perch = Perch("p", {"up": 1.0, "down": 2.0})
+        del perch.data["up"]
+        del perch.data["down"]
+
+        assert perch.up is None
+        assert perch.down is None
+        assert perch.comp is None
+    
+    def test_load_1_3_1_pickle(self, tmp_path):
+        """
+        Test that circuits saved by 1.3.1, with dictionary-backed perches, still load.
+        """
+        def old_perch(name, data):
+            return Pickled131(Perch, {"name": name, "data": data,
+                                      "_initialized_keys": {k for k, v in data.items() if v is not None}})
+
+        def old_mover(source, target):
+            return Pickled131(Mover, {"source_name": source, "target_name": target, "edge_type": "backward",
+                                      "map_data": {"operation": "abs"}, "parameters": {},
+                                      "numerical_hyperparameters": {}, "comp": abs,
+                                      "source_keys": ["up"], "target_key": "up"})
+
+        backward_graph, forward_graph = nx.DiGraph(), nx.DiGraph()
+        for graph in (backward_graph, forward_graph):
+            graph.add_nodes_from(["a", "b", "c"])
+        backward_graph.add_edge("c", "b", mover=old_mover("c", "b"))
+        backward_graph.add_edge("b", "a", mover=old_mover("b", "a"))
+        state = {"name": "old",
+                 "perches": {"a": old_perch("a", {"up": None, "down": None}),
+                             "b": old_perch("b", {"up": None, "down": None}),
+                             "c": old_perch("c", {"up": -2.0, "down": None, "grid": np.arange(3.0)})},
+                 "backward_graph": backward_graph, "forward_graph": forward_graph,
+                 "has_empty_perches": False, "has_model": True, "movers_backward_exist": True,
+                 "is_portable": True, "is_solvable": False, "is_solved": False, "is_simulated": False}
+        path = tmp_path / "old.pkl"
+        path.write_bytes(pickle.dumps(Pickled131(CircuitBoard, state)))
+
+        circuit = CircuitBoard.load(str(path))
+
+        assert circuit.perches["c"].up == -2.0
+        np.testing.assert_array_equal(circuit.get_perch_data("c", "grid"), [0.0, 1.0, 2.0])
+        assert circuit.perches["c"]._store is circuit._store
+        assert circuit.has_model and circuit.is_portable
+        assert [mover.edge_id for mover in circuit._edges] == [0, 1]
+
+        circuit.run_schedule("backward")
+        assert circuit.get_perch_data("b", "up") == 2.0
+        assert circuit.get_perch_data("a", "up") == 2.0
+    
+    def test_get_perch_data_bulk(self):
+        """
+        Test that bulk reads return one key of several perches in order.
+        """
+        circuit = CircuitBoard()
+        circuit.add_perch(Perch("p0", {"up": 1.0}))
+        circuit.add_perch(Perch("p1", {"up": None, "extra": 2}))
+
+        assert circuit.get_perch_data_bulk(["p1", "p0"], "up") == [None, 1.0]
+        with pytest.raises(KeyError):
+            circuit.get_perch_data_bulk(["p0", "p1"], "extra")
+        with pytest.raises(ValueError):
+            circuit.get_perch_data_bulk(["missing"], "up")
+
+    def test_reset_clears_perches_not_kept(self):
+        """
+        Test that reset clears all perch data except the kept perches.
+        """
+        circuit = CircuitBoard()
+        circuit.add_perch(Perch("p0", {"up": None}))
+        circuit.add_perch(Perch("p1", {"up": None}))
+        circuit.add_mover("p1", "p0", source_key="up", target_key="up", edge_type="backward")
+        circuit.finalize_model()
+        circuit.set_perch_data("p0", {"up": 1.0})
+        circuit.set_perch_data("p1", {"up": 2.0})
+        assert circuit.is_solvable
+
+        circuit.reset(keep=["p1"])
+        assert circuit.get_perch_data("p0", "up") is None
+        assert not circuit.perches["p0"].is_initialized("up")
+        assert circuit.get_perch_data("p1", "up") == 2.0
+        assert circuit.is_solvable
+
+        circuit.reset()
+        assert circuit.get_perch_data_bulk(["p0", "p1"], "up") == [None, None]
+        assert not circuit.is_solvable
+        with pytest.raises(ValueError):
+            circuit.reset(keep=["missing"])
+
+    def test_board_dtype_casts_float_arrays(self):
+        """
+        Test that a board dtype applies to floating point arrays only.
+        """
+        circuit = CircuitBoard(dtype=np.float32)
+        circuit.add_perch(Perch("p", {"up": np.array([10.0, 5.0]), "index": np.array([1, 2])}))
+
+        assert circuit.get_perch_data("p", "up").dtype == np.float32
+        assert circuit.get_perch_data("p", "index").dtype == np.array([1, 2]).dtype
+
+        circuit.set_perch_data("p", {"down": np.array([1.0]), "up": 2.0})
+        assert circuit.get_perch_data("p", "down").dtype == np.float32
+
+        assert circuit.get_perch_data("p", "up") == 2.0
+
+        with pytest.raises(ValueError):
+            CircuitBoard(dtype=np.int64)
+
+        circuit = CircuitBoard(dtype={"down": np.float32})
+        circuit.add_perch(Perch("p", {"up": np.array([1.0]), "down": np.array([1.0])}))
+        assert circuit.get_perch_data("p", "up").dtype == np.float64
+        assert circuit.get_perch_data("p", "down").dtype == np.float32
+        with pytest.raises(ValueError):
+            CircuitBoard(dtype={"down": np.int32})
+
+    def test_strided_arrays_stored_contiguous(self):
+        """
+        Test that non-contiguous float arrays are stored as aligned C-contiguous copies.
+        """
+        circuit = CircuitBoard()
+        circuit.add_perch(Perch("p", {"up": None}))
+        matrix = np.arange(16.0).reshape(4, 4)
+
+        circuit.set_perch_data("p", {"up": matrix[:, ::2]})
+        stored = circuit.get_perch_data("p", "up")
+        assert stored.flags.c_contiguous
+        assert stored.ctypes.data % 64 == 0
+        np.testing.assert_array_equal(stored, matrix[:, ::2])
+
+        contiguous = np.ones(3)
+        circuit.set_perch_data("p", {"up": contiguous})
+        assert circuit.get_perch_data("p", "up") is contiguous
+
+    def test_population_solves_all_instances_at_once(self):
+        """
+        Test that a population loads stacked fields, solves once and reads results back.
+        """
+        circuit = CircuitBoard()
+        circuit.add_perch(Perch("p0", {"up": None}))
+        circuit.add_perch(Perch("p1", {"up": None}))
+        circuit.add_mover("p1", "p0", source_key="up", target_key="up", edge_type="backward",
+                          map_data={"operation": "affine", "parameters": {"factor": 2.0, "offset": 1.0}})
+        circuit.make_portable(comp_factory)
+
+        population = PerchPopulation(3, dtype="float32")
+        for instance in range(3):
+            population.set(instance, "p1", "up", [instance, instance + 0.5])
+        assert population.get("p1", "up").shape == (3, 2)
+        assert population.get("p1", "up").dtype == np.float32
+
+        population.load(circuit)
+        circuit.run_schedule("backward")
+        population.collect(circuit)
+
+        for instance in range(3):
+            np.testing.assert_array_equal(population.get("p0", "up", instance),
+                                          [2 * instance + 1, 2 * instance + 2])
+        with pytest.raises(KeyError):
+            population.get("p2", "up")
+        with pytest.raises(ValueError):
+            PerchPopulation(0)
+
+    def test_population_fields_do_not_share_board_arrays(self):
+        """
+        Test that collected fields survive later solves and set calls leave the board alone.
+        """
+        circuit = CircuitBoard()
+        circuit.add_perch(Perch("p0", {"up": None}))
+        circuit.add_perch(Perch("p1", {"up": None}))
+        circuit.add_mover("p1", "p0", source_key="up", target_key="up", edge_type="backward",
+                          map_data={"operation": "scale", "parameters": {"factor": 2.0}})
+        circuit.make_portable(comp_factory)
+
+        first = PerchPopulation(2)
+        for instance in range(2):
+            first.set(instance, "p1", "up", float(instance + 1))
+        first.load(circuit)
+        circuit.run_schedule("backward", reuse_buffers=True)
+        first.collect(circuit)
+
+        second = PerchPopulation(2)
+        for instance in range(2):
+            second.set(instance, "p1", "up", 10.0 * (instance + 1))
+        second.load(circuit)
+        circuit.run_schedule("backward", reuse_buffers=True)
+        second.collect(circuit)
+
+        np.testing.assert_array_equal(first.get("p0", "up"), [2.0, 4.0])
+        np.testing.assert_array_equal(second.get("p0", "up"), [20.0, 40.0])
+
+        second.set(0, "p0", "up", -1.0)
+        second.set(0, "p1", "up", -1.0)
+        np.testing.assert_array_equal(circuit.get_perch_data("p0", "up"), [20.0, 40.0])
+        np.testing.assert_array_equal(circuit.get_perch_data("p1", "up"), [10.0, 20.0])
+
+    def test_population_unset_instances_are_nan(self):
+        """
+        Test that unset instances of floating point fields are NaN through a solve.
+        """
+        circuit = CircuitBoard()
+        circuit.add_perch(Perch("p0", {"up": None}))
+        circuit.add_perch(Perch("p1", {"up": None, "count": None}))
+        circuit.add_mover("p1", "p0", source_key="up", target_key="up", edge_type="backward",
+                          map_data={"operation": "square", "parameters": {}})
+        circuit.make_portable(comp_factory)
+
+        population = PerchPopulation(4)
+        population.set(1, "p1", "up", 3.0)
+        population.set(3, "p1", "up", 2.0)
+        population.set(0, "p1", "count", 5)
+        population.load(circuit)
+        circuit.run_schedule("backward")
+        population.collect(circuit)
+
+        np.testing.assert_array_equal(population.unset("p0", "up"), [0, 2])
+        np.testing.assert_array_equal(population.get("p0", "up")[[1, 3]], [9.0, 4.0])
+        assert population.unset("p1", "count").size == 0
+
+    def test_create_and_solve_circuit_batch(self):
+        """
+        Test that a batch of initial values is solved in one stacked circuit.
+        """
+        circuit, population = create_and_solve_circuit_batch(
+            name="Batch",
+            nodes=[{"id": "A", "data_types": ["up"]}, {"id": "B", "data_types": ["up"]}],
+            edges=[{"source": "B", "target": "A", "edge_type": "backward",
+                    "operation": lambda x: x * x, "source_key": "up", "target_key": "up"}],
+            initial_values_list=[{"B": {"up": 2.0}}, {"B": {"up": 3.0}}, {"B": {"up": 4.0}}],
+        )
+
+        np.testing.assert_array_equal(circuit.get_perch_data("A", "up"), [4.0, 9.0, 16.0])
+        assert population.get("A", "up", 1) == 9.0
+        with pytest.raises(ValueError):
+            create_and_solve_circuit_batch("Empty", [], [], [])
+
+    def test_forward_circuit_reuses_backward_circuit(self):
+        """
+        Test that forward movers can be added to and solved on a solved backward circuit.
+        """
+        nodes = [{"id": "A", "data_types": ["up"]}, {"id": "B", "data_types": ["up"]}]
+        backward = create_and_solve_backward_circuit(
+            "Backward", nodes,
+            edges=[{"source": "B", "target": "A", "operation": lambda x: x * x, "edge_type": "backward"}],
+            initial_values={"B": {"up": 3.0}},
+        )
+        forward = create_and_solve_forward_circuit(
+            "Forward", [{"id": "A", "data_types": ["up", "down"]}, {"id": "B", "data_types": ["up", "down"]}],
+            edges=[{"source": "A", "target": "B", "operation": lambda data: data["down"] + data["up"], "source_keys": ["up", "down"],
+                    "target_key": "down", "edge_type": "forward"}],
+            initial_values={"A": {"down": 1.0}},
+            initial_circuit=backward,
+        )
+
+        assert forward is backward
+        assert forward.get_perch_data("A", "up") == 9.0
+        assert forward.get_perch_data("B", "down") == 10.0
+
+    def test_helpers_solve_their_own_direction(self):
+        """
+        Test that the create-and-solve helpers run only their own solver.
+        """
+        nodes = [{"id": "A", "data_types": ["up", "down"]}, {"id": "B", "data_types": ["up", "down"]}]
+        backward = create_and_solve_backward_circuit(
+            "Backward", nodes,
+            edges=[{"source": "B", "target": "A", "operation": lambda x: x + 1.0, "edge_type": "backward"}],
+            initial_values={"B": {"up": 3.0}},
+        )
+        assert backward.get_perch_data("A", "up") == 4.0
+
+        forward = create_and_solve_forward_circuit(
+            "Forward", nodes,
+            edges=[{"source": "A", "target": "B", "operation": lambda x: x * 2.0, "source_keys": ["down"],
+                    "target_key": "down", "edge_type": "forward"}],
+            initial_values={"A": {"up": 1.0, "down": 5.0}},
+        )
+        assert forward is not backward
+        assert forward.get_perch_data("B", "down") == 10.0
+        assert forward.get_perch_data("B", "up") is None
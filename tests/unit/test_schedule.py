@@ -0,0 +1,386 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from circuitcraft import CircuitBoard, Perch
+from circuitcraft.ops import comp_factory
+from circuitcraft.schedule import ScalarSegment, _compile_segment
+
+
+SCALE = 3.0
+
+
+def times_scale(x):
+    return x * SCALE
+
+
+def build_chain():
+    circuit = CircuitBoard()
+    for name in ["p0", "p1", "p2"]:
+        circuit.add_perch(Perch(name))
+    circuit.add_mover("p2", "p1", source_key="up", target_key="up", edge_type="backward")
+    circuit.add_mover("p1", "p0", source_key="up", target_key="up", edge_type="backward")
+    circuit.add_mover("p0", "p1", source_key="down", target_key="down", edge_type="forward")
+    circuit.add_mover("p1", "p2", source_key="down", target_key="down", edge_type="forward")
+    return circuit
+
+
+class TestSchedule:
+    """
+    Test suite for pre-resolved execution schedules.
+    """
+
+    def test_finalize_resolves_schedules(self):
+        """
+        Test that finalize_model resolves both schedules as perch id arrays.
+        """
+        circuit = build_chain()
+        circuit.finalize_model()
+
+        backward = circuit._schedules["backward"]
+        forward = circuit._schedules["forward"]
+        assert backward.order == ["p2", "p1", "p0"]
+        assert backward.src_idx.dtype == np.int32
+        np.testing.assert_array_equal(backward.src_idx, [2, 1])
+        np.testing.assert_array_equal(backward.tgt_idx, [1, 0])
+        np.testing.assert_array_equal(backward.edge_idx, [0, 1])
+        np.testing.assert_array_equal(forward.src_idx, [0, 1])
+        np.testing.assert_array_equal(forward.tgt_idx, [1, 2])
+        np.testing.assert_array_equal(forward.edge_idx, [2, 3])
+
+    def test_schedules_invalidated_by_graph_changes(self):
+        """
+        Test that adding perches or movers drops the resolved schedules.
+        """
+        circuit = build_chain()
+        circuit.finalize_model()
+        movers = circuit._graph_movers("backward")
+        assert circuit._schedules
+        assert circuit._graph_movers("backward") is movers
+
+        assert circuit._get_terminal_perches("backward") == ["p0"]
+        assert circuit.get_initial_perches("backward") == ["p2"]
+        assert circuit.get_terminal_perches("forward") is not circuit.get_terminal_perches("forward")
+        assert circuit._get_initial_perches("forward") is circuit._get_initial_perches("forward")
+
+        circuit.add_perch(Perch("p3"))
+        assert not circuit._schedules and not circuit._mover_lists
+        assert circuit._get_terminal_perches("backward") == ["p0", "p3"]
+
+        circuit.add_mover("p3", "p2", source_key="up", target_key="up", edge_type="backward")
+        schedule = circuit._get_schedule("backward")
+        assert len(schedule) == 3
+        assert schedule.movers[0].source_name == "p3"
+
+    def test_cyclic_graph(self):
+        """
+        Test that cycles do not break finalize_model but are rejected when scheduling.
+        """
+        circuit = build_chain()
+        circuit.add_mover("p0", "p2", source_key="up", target_key="up", edge_type="backward")
+        circuit.finalize_model()
+
+        assert "backward" not in circuit._schedules
+        with pytest.raises(nx.NetworkXUnfeasible):
+            circuit._get_schedule("backward")
+
+    def test_movers_looked_up_by_edge_id(self):
+        """
+        Test that movers get integer edge ids and re-adding an edge replaces its mover.
+        """
+        circuit = build_chain()
+        mover = circuit.backward_graph["p1"]["p0"]["mover"]
+
+        assert [m.edge_id for m in circuit._edges] == [0, 1, 2, 3]
+        assert circuit._get_mover("p1", "p0", "backward") is mover
+        assert circuit._get_mover("p0", "p1", "forward") is not mover
+
+        circuit.add_mover("p1", "p0", source_key="up", target_key="up", edge_type="backward")
+        replacement = circuit._get_mover("p1", "p0", "backward")
+        assert replacement is not mover
+        assert replacement.edge_id == mover.edge_id
+        assert len(circuit._edges) == 4
+
+        with pytest.raises(ValueError):
+            circuit._get_mover("p0", "p1", "backward")
+        with pytest.raises(ValueError):
+            circuit._get_mover("p0", "missing", "forward")
+        with pytest.raises(ValueError):
+            circuit._get_mover("p1", "p0", "sideways")
+
+    def test_run_schedule_matches_solver(self):
+        """
+        Test that a single scheduled pass gives the solver's results for scalars and arrays.
+        """
+        def build():
+            circuit = CircuitBoard()
+            for name in ["p0", "p1", "p2", "p3"]:
+                circuit.add_perch(Perch(name))
+            for source, target, operation in [("p3", "p2", "scale"), ("p2", "p1", "shift"), ("p1", "p0", "square")]:
+                circuit.add_mover(source, target, source_key="up", target_key="up", edge_type="backward",
+                                  map_data={"operation": operation, "parameters": {"factor": 0.5, "offset": 1.0}})
+            circuit.make_portable(comp_factory)
+            circuit.finalize_model()
+            return circuit
+
+        for value in [3.0, np.array([3.0, 5.0])]:
+            solved, scheduled = build(), build()
+            solved.set_perch_data("p3", {"up": value})
+            scheduled.set_perch_data("p3", {"up": value})
+            solved.solve_backward()
+            scheduled.run_schedule("backward")
+            for name in ["p0", "p1", "p2"]:
+                np.testing.assert_array_equal(scheduled.get_perch_data(name, "up"),
+                                              solved.get_perch_data(name, "up"))
+            assert scheduled.perches["p0"].is_initialized("up")
+
+        steps = scheduled._get_schedule("backward").steps()
+        assert len(steps) == 1 and isinstance(steps[0], ScalarSegment)
+        assert steps[0].inputs == [0] and steps[0].outputs == [1, 2, 3]
+        assert "buf[2] = x + 1.0 if x is not None else buf[2]" in steps[0].source
+
+    def test_segment_compilations_are_bounded(self):
+        """
+        Test that compiled segment sources are shared and the cache is bounded.
+        """
+        source = "def segment(buf):\n    buf[0] = 1.0\n"
+        assert _compile_segment(source) is _compile_segment(source)
+        assert _compile_segment.cache_info().maxsize is not None
+
+    def test_run_schedule_with_unset_values(self):
+        """
+        Test that unset values inside a scalar run leave their targets unchanged.
+        """
+        circuit = CircuitBoard()
+        for name in ["p0", "p1", "p2", "p3"]:
+            circuit.add_perch(Perch(name))
+        for source, target in [("p3", "p2"), ("p2", "p1"), ("p1", "p0")]:
+            circuit.add_mover(source, target, source_key="up", target_key="up", edge_type="backward",
+                              map_data={"operation": "shift", "parameters": {"offset": 1.0}})
+        circuit.make_portable(comp_factory)
+        circuit.finalize_model()
+
+        circuit.set_perch_data("p2", {"up": 5.0})
+        circuit.run_schedule("backward")
+
+        assert circuit.get_perch_data("p3", "up") is None
+        assert circuit.get_perch_data("p2", "up") == 5.0
+        assert circuit.get_perch_data("p1", "up") == 6.0
+        assert circuit.get_perch_data("p0", "up") == 7.0
+        assert not circuit.perches["p3"].is_initialized("up")
+
+    def test_run_schedule_with_nan_values(self):
+        """
+        Test that NaN inputs propagate through a scalar run as they do per mover.
+        """
+        def build():
+            circuit = CircuitBoard()
+            for name in ["A", "B", "C"]:
+                circuit.add_perch(Perch(name))
+            for source, target in [("C", "B"), ("B", "A")]:
+                circuit.add_mover(source, target, source_key="up", target_key="up", edge_type="backward",
+                                  map_data={"operation": "shift", "parameters": {"offset": 1.0}})
+            circuit.make_portable(comp_factory)
+            circuit.finalize_model()
+            circuit.set_perch_data("B", {"up": 7.0})
+            circuit.set_perch_data("C", {"up": float("nan")})
+            return circuit
+
+        scheduled, executed = build(), build()
+        scheduled.run_schedule("backward")
+        executed.execute_mover("C", "B", "backward")
+        executed.execute_mover("B", "A", "backward")
+        for name in ["A", "B"]:
+            assert np.isnan(scheduled.get_perch_data(name, "up"))
+            assert np.isnan(executed.get_perch_data(name, "up"))
+
+    @pytest.mark.parametrize("factor", [float("inf"), np.float32(0.1)])
+    def test_run_schedule_matches_per_mover_parameters(self, factor):
+        """
+        Test that non-finite and NumPy scalar parameters give the per-mover result.
+        """
+        def build():
+            circuit = CircuitBoard()
+            for name in ["A", "B", "C"]:
+                circuit.add_perch(Perch(name))
+            circuit.add_mover("C", "B", source_key="up", target_key="up", edge_type="backward",
+                              map_data={"operation": "scale", "parameters": {"factor": factor}})
+            circuit.add_mover("B", "A", source_key="up", target_key="up", edge_type="backward",
+                              map_data={"operation": "shift", "parameters": {"offset": 1.0}})
+            circuit.make_portable(comp_factory)
+            circuit.finalize_model()
+            circuit.set_perch_data("C", {"up": 2.0})
+            return circuit
+
+        scheduled, executed = build(), build()
+        scheduled.run_schedule("backward")
+        executed.execute_mover("C", "B", "backward")
+        executed.execute_mover("B", "A", "backward")
+        for name in ["A", "B"]:
+            result, expected = scheduled.get_perch_data(name, "up"), executed.get_perch_data(name, "up")
+            assert result == expected and type(result) is type(expected)
+
+    def test_segments_survive_save_and_load(self, tmp_path):
+        """
+        Test that a circuit holding scalar segments can be saved and loaded.
+        """
+        circuit = CircuitBoard()
+        for name in ["p0", "p1", "p2"]:
+            circuit.add_perch(Perch(name))
+        for source, target in [("p2", "p1"), ("p1", "p0")]:
+            circuit.add_mover(source, target, source_key="up", target_key="up", edge_type="backward",
+                              map_data={"operation": "shift", "parameters": {"offset": 1.0}})
+        circuit.make_portable(comp_factory)
+        circuit.finalize_model()
+        assert isinstance(circuit._get_schedule("backward").steps()[0], ScalarSegment)
+
+        circuit.save(tmp_path / "circuit.pkl")
+        loaded = CircuitBoard.load(tmp_path / "circuit.pkl")
+        segment = loaded._get_schedule("backward").steps()[0]
+        loaded.set_perch_data("p2", {"up": 1.0})
+        segment.write_back(segment.run(loaded._store.columns), loaded._perch_list)
+        assert loaded.get_perch_data("p0", "up") == 3.0
+
+    def test_save_and_load_after_run_schedule(self, tmp_path):
+        """
+        Test that generated plans do not stop a circuit from being saved.
+        """
+        circuit = build_chain()
+        for (source, target), operation in zip([("p2", "p1"), ("p1", "p0")], ["shift", "scale"]):
+            op = comp_factory({"map": {"operation": operation, "parameters": {"offset": 1.0, "factor": 2.0}}})
+            circuit.set_mover_comp(source, target, "backward", op)
+        circuit.make_portable(comp_factory)
+        circuit.set_perch_data("p2", {"up": 1.0})
+        circuit.run_schedule("backward")
+        circuit.run_schedule("backward", targets=["p1"])
+
+        circuit.save(tmp_path / "circuit.pkl")
+        loaded = CircuitBoard.load(tmp_path / "circuit.pkl")
+        assert loaded.get_perch_data("p0", "up") == 4.0
+        loaded.set_perch_data("p2", {"up": 2.0})
+        loaded.run_schedule("backward")
+        assert loaded.get_perch_data("p0", "up") == 6.0
+
+    def test_levels_and_threaded_run(self):
+        """
+        Test that levels group independent movers and that running them on a
+        thread pool gives the serial result.
+        """
+        def build():
+            circuit = CircuitBoard()
+            for name in ["p0", "p1", "p2", "p3"]:
+                circuit.add_perch(Perch(name))
+            for source, target, factor in [("p0", "p1", 2.0), ("p0", "p2", 3.0), ("p1", "p3", 4.0), ("p2", "p3", 5.0)]:
+                circuit.add_mover(source, target, source_key="down", target_key="down", edge_type="forward",
+                                  map_data={"operation": "scale", "parameters": {"factor": factor}})
+            circuit.make_portable(comp_factory)
+            circuit.set_perch_data("p0", {"down": np.arange(4.0)})
+            return circuit
+
+        serial, threaded = build(), build()
+        levels = threaded._get_schedule("forward").levels()
+        assert [[(m.source_name, m.target_name) for m in level] for level in levels] == [
+            [("p0", "p1"), ("p0", "p2")], [("p1", "p3")], [("p2", "p3")]]
+
+        serial.run_schedule("forward")
+        threaded.run_schedule("forward", max_workers=2)
+        for name in ["p1", "p2", "p3"]:
+            np.testing.assert_array_equal(threaded.get_perch_data(name, "down"),
+                                          serial.get_perch_data(name, "down"))
+
+    def test_plan_follows_comp_changes(self):
+        """
+        Test that the generated plan runs user comps, is regenerated when a
+        comp changes, and reports missing source keys.
+        """
+        circuit = build_chain()
+        circuit.set_perch_data("p2", {"up": 2.0})
+        circuit.set_mover_comp("p2", "p1", "backward", lambda x: {"up": x + 1, "other": 0})
+        circuit.set_mover_comp("p1", "p0", "backward", lambda x: 10 * x)
+
+        schedule = circuit._get_schedule("backward")
+        plan = schedule.plan()
+        circuit.run_schedule("backward")
+        assert circuit.get_perch_data("p0", "up") == 30.0
+        assert circuit.perches["p0"].is_initialized("up")
+        assert schedule.plan() is plan
+
+        circuit.set_mover_comp("p1", "p0", "backward", lambda x: -x)
+        circuit.run_schedule("backward")
+        assert schedule.plan() is not plan
+        assert circuit.get_perch_data("p0", "up") == -3.0
+
+        assert "r = -x0" in schedule.plan().source
+
+        circuit.perches["p2"].clear_data()
+        circuit.perches["p2"].data.pop("up")
+        with pytest.raises(KeyError, match="Key 'up' not found in perch 'p2'"):
+            circuit.run_schedule("backward")
+
+    def test_run_schedule_for_targets(self):
+        """
+        Test that running for target perches skips movers they don't depend on.
+        """
+        circuit = CircuitBoard()
+        for name in ["p0", "p1", "p2", "p3"]:
+            circuit.add_perch(Perch(name))
+        for source, target in [("p0", "p1"), ("p1", "p2"), ("p0", "p3")]:
+            circuit.add_mover(source, target, source_key="down", target_key="down", edge_type="forward",
+                              map_data={"operation": "shift", "parameters": {"offset": 1.0}})
+        circuit.make_portable(comp_factory)
+        circuit.set_perch_data("p0", {"down": 0.0})
+
+        schedule = circuit._get_schedule("forward")
+        restricted = schedule.restrict([circuit._perch_index["p2"]])
+        assert [(m.source_name, m.target_name) for m in restricted.movers] == [("p0", "p1"), ("p1", "p2")]
+        assert restricted.order == ["p0", "p1", "p2"]
+        assert schedule.restrict([circuit._perch_index["p2"]]) is restricted
+
+        circuit.run_schedule("forward", targets=["p2"])
+        assert circuit.get_perch_data("p2", "down") == 2.0
+        assert circuit.get_perch_data("p3", "down") is None
+
+        with pytest.raises(ValueError):
+            circuit.run_schedule("forward", targets=["missing"])
+
+    def test_plan_inlines_expression_comps(self):
+        """
+        Test that single-expression comps are spliced into the plan, and
+        other comps are still called.
+        """
+        def halve_abs(x):
+            """Halve the absolute value."""
+            return np.abs(x) * 0.5
+
+        def shift(x):
+            y = x + 1
+            return y
+
+        circuit = build_chain()
+        circuit.set_perch_data("p2", {"up": np.array([-4.0, 2.0])})
+        circuit.set_mover_comp("p2", "p1", "backward", halve_abs)
+        circuit.set_mover_comp("p1", "p0", "backward", shift)
+        circuit.run_schedule("backward")
+
+        source = circuit._get_schedule("backward").plan().source
+        assert ".abs(x0) * 0.5" in source
+        assert "r = k" in source
+        np.testing.assert_array_equal(circuit.get_perch_data("p1", "up"), [2.0, 1.0])
+        np.testing.assert_array_equal(circuit.get_perch_data("p0", "up"), [3.0, 2.0])
+
+    def test_inlined_comps_see_rebound_globals(self, monkeypatch):
+        """
+        Test that inlined comps read their globals when the plan runs.
+        """
+        circuit = build_chain()
+        circuit.set_mover_comp("p2", "p1", "backward", times_scale)
+        circuit.set_mover_comp("p1", "p0", "backward", lambda x: abs(x))
+        circuit.set_perch_data("p2", {"up": -2.0})
+        circuit.run_schedule("backward")
+        assert circuit.get_perch_data("p0", "up") == 6.0
+        assert "['SCALE']" in circuit._get_schedule("backward").plan().source
+
+        monkeypatch.setitem(times_scale.__globals__, "SCALE", 10.0)
+        circuit.run_schedule("backward")
+        assert circuit.get_perch_data("p0", "up") == 20.0
+        assert circuit.execute_mover("p2", "p1", "backward") == -20.0